@@ -1,6 +1,9 @@
 from .handles import *
 from .shell import *
 from .walking import * 
+from .index import *
+from .snapshots import *
+from .watching import *
 from .persistence import *
 from .shortcuts import *
 
@@ -21,7 +21,6 @@ Thing management wrappers on os.path, shutil, and useful non-standard modules
 TODO
     Add relative path support
     Classes for specific mimes
-    A version of @cached_property which checks the date modified before determining whether or not to recompute
     Caches for new directories which include objects to add to them upon creation
     Strict searching
     Caches for pickling (backup simplification)
@@ -29,20 +28,32 @@ TODO
 """
 __all__ = (
     'forbiddens Thing Place Thing Path Address Directory Folder File Library Scanner'
-    .split()
+    ' fresh_property property_cache_info'.split()
 )
 
-from itertools import chain
-from typing import Iterable, Iterator, TypeAlias, Callable
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+    FIRST_COMPLETED,
+)
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Iterable, Iterator, TypeAlias, Callable, AsyncIterator, NamedTuple
 from warnings import warn
-import io, os, pathlib, re, sys, shutil
+import heapq, io, mmap, os, pathlib, re, sys
 
 from send2trash import send2trash
-from sl4ng import unique, nice_size
+from sl4ng import nice_size
 from sl4ng import pop, show
 import audio_metadata as am, filetype as ft
 
 from . import shell, walking
+from .index import TreeIndex, TrigramIndex, SizeCache, Usage
+from .snapshots import Snapshot
+from .watching import Watcher
 
 
 formats = {  # incase mimes fail
@@ -66,6 +77,49 @@ _File: TypeAlias = "File"
 _Filestr: TypeAlias = "File|str"
 SYSTEM_PATH: TypeAlias = type(pathlib.Path(__file__))
 
+SNIFF = 8192  # bytes read when checking whether or not a file is binary
+CHUNK = 1 << 20  # characters, or bytes, read at a time when scanning a file's content
+AUTOMATON = 24  # keywords needed for a non-strict Scanner to use AhoCorasick
+SIZES = SizeCache()  # directory totals shared by every Place
+WALKS = frozenset(
+    "workers ordered order max_depth exclude ignore".split()
+)  # search kwargs which shape a walk, and so can't be answered by a TreeIndex
+
+
+def _extensions() -> dict[str, str | None]:
+    """
+    Map each extension filetype recognises to its mime, or to None if it recognises several mimes by it
+    """
+    mimes = {}
+    for kind in ft.types:
+        ext = '.' + kind.extension
+        mimes[ext] = kind.MIME if mimes.get(ext, kind.MIME) == kind.MIME else None
+    return mimes
+
+
+EXTENSIONS = _extensions()  # Place.profile trusts these instead of sniffing
+
+
+def _sniff(path: str) -> str | None:
+    """
+    The mime of a file according to its header, or None if filetype doesn't recognise it
+    """
+    try:
+        return match.MIME if (match := ft.guess(path)) else None
+    except OSError:
+        return None
+
+
+def _indexable(kwargs: dict) -> dict:
+    """
+    Check that a search's kwargs can be answered by a TreeIndex, which is queried rather than walked
+    """
+    if given := sorted(WALKS.intersection(kwargs)):
+        raise TypeError(
+            f"Index searches can't take {', '.join(given)}, search with index=False to use them"
+        )
+    return kwargs
+
 
 class MemorySize(int):
     """
@@ -76,6 +130,100 @@ class MemorySize(int):
         return nice_size(self)
 
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+
+
+class Share(NamedTuple):
+    files: int
+    bytes: int
+
+
+class Profile(NamedTuple):
+    """
+    What a Place's files are made of. Each field maps a label to the number of files, and of bytes, bearing it
+        mimes
+            eg "image/png". Files of unrecognised types are counted under None
+        kinds
+            the mimes' types, eg "image"
+        exts
+            eg ".png". Files without extensions are counted under ""
+    """
+
+    mimes: dict[str | None, Share]
+    kinds: dict[str | None, Share]
+    exts: dict[str, Share]
+
+
+class _Fresh(dict):
+    """
+    An instance's fresh_property values, keyed by their descriptors
+    They only hold for the process which computed them, so a pickled handle gets an empty cache instead
+    """
+
+    def __reduce__(self):
+        return _Fresh, ()
+
+
+class fresh_property:
+    """
+    A cached_property which recomputes whenever the date modified of its instance's path changes
+    Set fresh_property.enabled to False to recompute on every access everywhere,
+    or an instance's "caching" attribute to False to do so for that instance alone
+    """
+
+    enabled = True
+    registry = []
+
+    def __init__(self, method: Callable):
+        self.method = method
+        self.name = method.__qualname__
+        self.__doc__ = method.__doc__
+        self.hits = self.misses = 0
+        fresh_property.registry.append(self)
+
+    def __get__(self, instance: object, owner: type = None):
+        if instance is None:
+            return self
+        if not (self.enabled and getattr(instance, 'caching', True)):
+            return self.method(instance)
+        cache = getattr(instance, '_fresh', None)
+        if cache is None:
+            cache = instance._fresh = _Fresh()
+        try:
+            stamp = instance._stamp()
+        except OSError:
+            cache.pop(self, None)
+            return self.method(instance)
+        if (entry := cache.get(self)) and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = self.method(instance)
+        cache[self] = stamp, value
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Hits and misses of this property across every instance
+        """
+        return CacheInfo(self.hits, self.misses)
+
+    def cache_clear(self) -> None:
+        """
+        Reset the counters. Cached values are dropped when their instances are, or when their paths change
+        """
+        self.hits = self.misses = 0
+
+
+def property_cache_info() -> dict[str, CacheInfo]:
+    """
+    Hits and misses of every fresh_property, by qualified name
+    """
+    return {prop.name: prop.cache_info() for prop in fresh_property.registry}
+
+
 class Library:
     """
     Allows categorization for multiple searching and can also be used as a makeshift playlist
@@ -89,7 +237,10 @@ class Library:
         self.index = -1
 
     def __iter__(self) -> Iterator[str]:
-        return self
+        """
+        Step through a snapshot of self.paths. Each call gets its own iterator, so loops can be nested
+        """
+        yield from [*self.paths]
 
     def __next__(self) -> str:
         if self.index < len(self.paths) - 1:
@@ -98,7 +249,9 @@ class Library:
         self.index = -1
         raise StopIteration
 
-    def __call__(self, terms, **kwargs) -> Iterator[str]:
+    def __call__(
+        self, terms, index: bool = False, fuzzy: bool | TrigramIndex = False, **kwargs
+    ) -> Iterator[str]:
         """
         Find files under directories in self.paths matching the given terms/criteria
         Any files in self.path will also be yielded if they match
@@ -110,6 +263,17 @@ class Library:
                     separate by spaces
                     an empty string simply walks the full tree
             Kwargs
+                index:bool
+                    True -> answer from each directory's TreeIndex, refreshing it first, instead of walking
+                        Can't be combined with workers, order, max_depth, exclude, or ignore
+                fuzzy:bool|TrigramIndex
+                    True -> yield the k paths whose names are most similar to the terms, best first.
+                        The remaining kwargs decide which paths are ranked
+                    TrigramIndex -> rank the paths in the given index instead. Reuse one to avoid rebuilding it
+                k:int
+                    the number of fuzzy results, defaults to 10
+                threshold:float
+                    the least similarity worth yielding in a fuzzy search, defaults to 0.3
                 exts:str
                     any file extensions you wish to check for, separate by spaces
                 case:bool
@@ -132,25 +296,113 @@ class Library:
                 names:bool
                     True -> only yield results whose names match
                     False -> yield results who match at any level
-        """
+                workers:int
+                    number of threads reading directories concurrently
+                order:str
+                    'dfs' -> depth-first, 'bfs' -> breadth-first
+                max_depth:int
+                    how many levels beneath self to search. 1 -> self's immediate content only
+                exclude:str|list[str]
+                    .gitignore-style rules for anything which should be skipped, eg: "node_modules .git"
+                ignore:str|list[str]
+                    names of ignore files, eg ".gitignore", to honour along the way
+        """
+        if fuzzy:
+            k, threshold = kwargs.pop('k', 10), kwargs.pop('threshold', 0.3)
+            if not isinstance(fuzzy, TrigramIndex):
+                fuzzy = TrigramIndex(self('', index, **kwargs))
+            yield from fuzzy(terms, k, kwargs.get('exts', ''), threshold)
+            return
+        if index:
+            _indexable(kwargs)
         for i in self:
             if os.path.isfile(i):
                 yield i
+            elif index:
+                with TreeIndex(i) as tree:
+                    yield from tree.refresh()(terms, **kwargs)
             elif os.path.isdir(i):
                 yield from walking.search(i, terms, **kwargs)
 
+    def search_many(
+        self, queries: Iterable[str | dict] | dict, **kwargs
+    ) -> Iterator[tuple[object, str]]:
+        """
+        Run many searches over the directories in self.paths, walking each of them only once
+        Yields (tag, path) pairs. Any files in self.paths are yielded for every search they match
+
+        Params
+            Args
+                queries:list[str|dict]|dict
+                    the searches. Each one is either a terms string or a dict of self.__call__'s search kwargs.
+                    A dict of searches tags results with their keys instead of the searches themselves
+            Kwargs
+                workers, order, max_depth, exclude, ignore
+                    shared by every search, see self.__call__
+        """
+        if not isinstance(queries, dict):
+            queries = [*queries]
+        specs = walking._batch(queries)
+        for i in self:
+            if os.path.isfile(i):
+                for tag in walking._matches(specs, os.path.split(i)[1], i, False):
+                    yield tag, i
+            elif os.path.isdir(i):
+                yield from walking.search_many(i, queries, **kwargs)
+
 
 class Thing:
     """
     Base class for a non-descript path-string.
     Relative paths are not currently supported
     Methods return self unless otherwise stated
+    The path is made absolute at once, against the current working directory,
+    but its symlinks are only resolved, and its existence checked, when it is first used
     """
 
+    __slots__ = ('_path', '_real', 'caching', '_fresh')
+
     def __init__(self, path: str):
-        self.path = path = os.path.realpath(str(path))
-        if not os.path.exists(path):
-            warn(f'Warning: Path "{path}" does not exist', Warning)
+        self._path, self._real = os.path.abspath(str(path)), False
+
+    @classmethod
+    def _bare(cls, path: str, real: bool) -> _Path:
+        """
+        Make an instance without any of the checks done by __init__
+        """
+        thing = object.__new__(cls)
+        thing._path, thing._real = path, real
+        return thing
+
+    @staticmethod
+    def from_entry(entry: os.DirEntry, real: bool = False) -> _Path:
+        """
+        Thing(entry.path).obj, using the type information cached by scandir instead of stat'ing the path
+        Params
+            real
+                True -> entry.path is known to be free of symlinks, so it needn't be resolved
+        """
+        if entry.is_dir():
+            return Place._bare(entry.path, real)
+        elif entry.is_file():
+            return File._bare(entry.path, real)
+        return Thing._bare(entry.path, real)
+
+    @property
+    def path(self) -> str:
+        """
+        The real path of the referent
+        """
+        if not self._real:
+            self._path = path = os.path.realpath(self._path)
+            self._real = True
+            if not os.path.exists(path):
+                warn(f'Warning: Path "{path}" does not exist', Warning)
+        return self._path
+
+    @path.setter
+    def path(self, path: str):
+        self._path, self._real = path, True
 
     def __eq__(self, other: _Pathstr) -> bool:
         if isinstance(other, (str, type(self))):
@@ -210,6 +462,13 @@ class Thing:
             self = Place(self.path)
         return self
 
+    def _stamp(self) -> tuple[int, int, int]:
+        """
+        What fresh_properties check before reusing a value: the inode, size, and date modified of the path
+        """
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
     @property
     def __short_repr(self) -> str:
         """
@@ -389,15 +648,21 @@ class Thing:
             raise OSError("One or both paths point to a non-existent entity")
 
     def clone(
-        self, folder: str = None, name: str = None, sep: str = '_', touch=False
+        self,
+        folder: str = None,
+        name: str = None,
+        sep: str = '_',
+        touch=False,
+        workers: int = None,
     ) -> _Path:
         """
         Returns a clone of the referent at a given Place-path
         The given path will be created if it doesn't exist
         Will copy in the Thing's original folder if no path is given
         The cwd switch will always copy to the current working Place
+        Files are copied by shell.copy_file, in constant memory, and directories by shell.copy_tree,
+            which copies up to "workers" files at a time
         """
-        copier = (shutil.copy2, shutil.copytree)[self.isdir]
         if not self.exists:
             raise NotImplementedError(
                 f"Copying is not implemented for inexistant files/directories"
@@ -406,15 +671,18 @@ class Thing:
             new = os.path.join(folder, name if name else self.name)
         else:
             new = self.path
-        new = shell.namespacer(new, sep=sep)
+        new = shell.NameSpacer(sep + "{index}")(new)
         os.makedirs(shell.delevel(new), exist_ok=True)
-        copier(self.path, new)
+        if self.isdir:
+            shell.copy_tree(self.path, new, workers=workers)
+        else:
+            shell.copy_file(self.path, new)
         out = Thing(new).obj
         return out.touch() if touch else out
 
     def move(self, folder: _Placestr, dodge: bool = False) -> _Path:
         """
-        This will clone and delete the underlying file/directory
+        The referent is renamed, unless the folder is on another device, in which case it is copied there and then deleted
         addy.move(folder) -> move to the given Place ()
         addy.move(name) -> move to the given path (relative paths will follow from the objects existing path)
         addy.move(folder, name) -> move to the given Place
@@ -432,7 +700,7 @@ class Thing:
             raise OSError(f"{ self.__short_repr} does not exist")
         folder = str(folder)
         if not os.path.exists(folder):
-            raise OSError(f"folder={other.__short_repr} does not exist")
+            raise OSError(f"{folder=} does not exist")
         self.path = shell.move(self.path, folder)
         return self
 
@@ -455,13 +723,21 @@ class File(Thing):
     Create a new File object for context management and ordinary operations
     """
 
+    __slots__ = ('__stream',)
+
     def __init__(self, path: str = 'NewThing'):
         path = os.path.abspath(shell.trim(path))
         if os.path.isdir(path):
             raise ValueError("Given path corresponds to a directory")
-        super(type(self), self).__init__(path)
+        super().__init__(path)
         self.__stream = None
 
+    @classmethod
+    def _bare(cls, path: str, real: bool) -> _File:
+        thing = super()._bare(path, real)
+        thing.__stream = None
+        return thing
+
     def __enter__(self):
         return self.open()
 
@@ -473,13 +749,13 @@ class File(Thing):
         if self.exists:
             return MemorySize(os.stat(self.path).st_size)
 
-    @property
+    @fresh_property
     def mime(self) -> str | type(None):
         return match.MIME if (match := ft.guess(self.path)) else None
 
-    @property
+    @fresh_property
     def kind(self) -> str | type(None):
-        return self.mime.split('/')[0] if (match := ft.guess(self.path)) else None
+        return mime.split('/')[0] if (mime := self.mime) else None
 
     @property
     def ext(self) -> str:
@@ -516,7 +792,7 @@ class File(Thing):
     def close(self) -> _File:
         if self.__stream:
             self.__stream.close()
-            self.stream = None
+            self.__stream = None
         return self
 
     def cat(
@@ -550,10 +826,13 @@ class Place(Thing):
     Place('.') == Place(os.getcwd())
     """
 
+    __slots__ = ('index', 'cursor')
+
     def __init__(self, path: str = 'NewPlace'):
         if os.path.isfile(path):
             raise ValueError("Given path corresponds to a file")
         if path.startswith(r"\\wsl$"):
+            super().__init__(path)
             self.path = path
         else:
             if path == '.':
@@ -562,10 +841,15 @@ class Place(Thing):
                 path = shell.namespacer(path)
             elif path == '~':
                 path = os.path.expanduser(path)
-            path = os.path.abspath(shell.trim(path))
-            self.path = os.path.realpath(path)
-        super(type(self), self).__init__(path)
+            super().__init__(os.path.abspath(shell.trim(path)))
         self.index = -1
+        self.cursor = None
+
+    @classmethod
+    def _bare(cls, path: str, real: bool) -> _Place:
+        thing = super()._bare(path, real)
+        thing.index, thing.cursor = -1, None
+        return thing
 
     def __len__(self):
         return len(os.listdir(self.path))
@@ -574,17 +858,31 @@ class Place(Thing):
         """
         Check if the Place is empty or not
         """
-        return len(os.listdir(self.path)) > 0
+        with os.scandir(self.path) as entries:
+            return next(entries, None) is not None
 
     def __iter__(self) -> Iterator[_Placefile]:
-        return self
+        """
+        Yield self's content from a single scandir pass, building each object only when it is reached
+        Each call gets its own iterator, so loops can be nested or interleaved
+        """
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                yield Thing.from_entry(entry, not entry.is_symlink())
 
     def __next__(self) -> _Placefile:
-        if self.index < len(self) - 1:
-            self.index += 1
-            return self.content[self.index]
-        self.index = -1
-        raise StopIteration
+        """
+        Step through self's content one call at a time, starting over once it is exhausted
+        """
+        if self.cursor is None:
+            self.cursor = iter(self)
+        try:
+            thing = next(self.cursor)
+        except StopIteration:
+            self.index, self.cursor = -1, None
+            raise
+        self.index += 1
+        return thing
 
     def __getitem__(self, item: str | int) -> _Path:
         """
@@ -611,7 +909,13 @@ class Place(Thing):
             return Thing(os.path.join(self.path, other)).obj
         raise TypeError(f"Other must be a string")
 
-    def __call__(self, terms, **kwargs) -> Iterator[str]:
+    def __call__(
+        self,
+        terms,
+        index: bool | TreeIndex = False,
+        fuzzy: bool | TrigramIndex = False,
+        **kwargs,
+    ) -> Iterator[str]:
         """
         Find files under self.path matching the given terms/criteria
 
@@ -620,6 +924,18 @@ class Place(Thing):
                 terms:str
                     the terms sought after. an empty string simply walks
             Kwargs
+                index:bool|TreeIndex
+                    True -> answer from self's TreeIndex, refreshing it first, instead of walking
+                    TreeIndex -> answer from the given index as it stands
+                    Either way, it can't be combined with workers, order, max_depth, exclude, or ignore
+                fuzzy:bool|TrigramIndex
+                    True -> yield the k paths whose names are most similar to the terms, best first.
+                        The remaining kwargs decide which paths are ranked
+                    TrigramIndex -> rank the paths in the given index instead. Reuse one to avoid rebuilding it
+                k:int
+                    the number of fuzzy results, defaults to 10
+                threshold:float
+                    the least similarity worth yielding in a fuzzy search, defaults to 0.3
                 exts:str
                     any file extensions you wish to check for, separate by spaces
                 case:bool
@@ -644,10 +960,93 @@ class Place(Thing):
                 names:bool
                     True -> only yield results whose names match
                     False -> yield results who match at any level
+                workers:int
+                    number of threads reading directories concurrently
+                order:str
+                    'dfs' -> depth-first, 'bfs' -> breadth-first
+                max_depth:int
+                    how many levels beneath self to search. 1 -> self's immediate content only
+                exclude:str|list[str]
+                    .gitignore-style rules for anything which should be skipped, eg: "node_modules .git"
+                ignore:str|list[str]
+                    names of ignore files, eg ".gitignore", to honour along the way
         """
         # yield from Searcher(terms, ext='', folders=False, absolute=True, case=False, strict=True)(self.path)
         # yield from walking.search(self.path, terms, exts=exts, folders=folders, absolute=absolute, case=case, strict=strict, regex=regex, names=names)
-        yield from walking.search(self.path, terms, **kwargs)
+        if fuzzy:
+            k, threshold = kwargs.pop('k', 10), kwargs.pop('threshold', 0.3)
+            if not isinstance(fuzzy, TrigramIndex):
+                fuzzy = TrigramIndex(self('', index, **kwargs))
+            yield from fuzzy(terms, k, kwargs.get('exts', ''), threshold)
+        elif isinstance(index, TreeIndex):
+            yield from index(terms, **_indexable(kwargs))
+        elif index:
+            _indexable(kwargs)
+            with TreeIndex(self.path) as tree:
+                yield from tree.refresh()(terms, **kwargs)
+        else:
+            yield from walking.search(self.path, terms, **kwargs)
+
+    async def asearch(self, terms, **kwargs) -> AsyncIterator[str]:
+        """
+        Find files under self.path matching the given terms/criteria, without blocking the event loop
+        Takes the same keyword arguments as self.__call__, apart from index.
+        Directories are read on a bounded thread pool and results arrive as soon as they are found
+
+        example
+            >>> async for path in Place('~/music').asearch('alix perez', exts='mp3'):
+            ...     print(path)
+        """
+        async for path in walking.asearch(self.path, terms, **kwargs):
+            yield path
+
+    def grep(
+        self,
+        keywords: str,
+        workers: int = None,
+        offsets: bool = False,
+        ordered: bool = False,
+        strict: bool = True,
+        case: bool = False,
+        mode: str = 'r',
+        **kwargs,
+    ) -> Iterator[str | tuple[str, list[tuple[int, int]]]]:
+        """
+        Find the files under self.path whose names or content contain the keywords, using every core
+        See Scanner.scan_tree for the details
+
+        Params
+            keywords:str
+                terms to search for
+            workers:int
+                number of processes. None -> one per core, 1 -> scan in this process
+            offsets:bool
+                True -> yield (path, [(start, end), ...]) pairs locating each match in the file's content
+            ordered:bool
+                True -> yield in the walker's order, False -> as soon as results are ready
+            strict:bool
+                True -> search for the keywords as a clause, False -> for any of the words
+            case:bool
+                toggle case sensitivity
+            mode:str
+                'r' or 'rb'
+            kwargs
+                passed to walking.files, eg: exts, max_depth, exclude, ignore
+        """
+        scanner = Scanner(keywords, mode=mode, strict=strict, case=case)
+        yield from scanner.scan_tree(self, workers, offsets, ordered, **kwargs)
+
+    def watch(self, index: bool | TreeIndex = False) -> Watcher:
+        """
+        Follow changes to self's tree as they happen (Linux only)
+        Iterate over the result, with for or async for, to receive Change events
+
+        Params
+            index
+                True -> keep self's default TreeIndex up to date with every change. It is closed along with the Watcher
+                TreeIndex -> keep the given index up to date. It is left open
+        """
+        return Watcher(self.path, index)
 
     def gather(self, dirs: bool = False, absolute: bool = True) -> Iterator[str]:
         """
@@ -696,51 +1095,155 @@ class Place(Thing):
     @property
     def content(self) -> Iterator[Thing]:
         """
-        Return address-like objects from "os.listdir"
+        Return address-like objects from "os.scandir"
         """
-        return tuple(
-            Thing(os.path.join(self.path, i)).obj for i in os.listdir(self.path)
-        )
+        return tuple(self)
 
     @property
     def leaves(self) -> Iterator[File]:
         """
         Return All Things from all branches
         """
-        yield from map(lambda x: Thing(x).obj, walking.files(self.path, absolute=True))
+        for entry, descend in walking._scan(self.path):
+            if not descend:
+                yield Thing.from_entry(entry)
 
     @property
     def branches(self) -> Iterator[_Place]:
         """
         Return Every Place whose path contains "self.path"
         """
-        yield from map(
-            lambda x: Thing(x).obj, walking.folders(self.path, absolute=True)
-        )
+        for entry, descend in walking._scan(self.path):
+            if descend:
+                yield Place._bare(entry.path, False)
 
-    @property
+    def _stamp(self) -> int:
+        """
+        What fresh_properties check before reusing a value: the dates modified of every directory in the tree
+        The total size is found in the same pass, for self.size
+        """
+        return SIZES.measure(self.path)[0]
+
+    @fresh_property
     def size(self) -> MemorySize:
         """
         Return the sum of sizes of all files in self and branches
+        Hard links are only counted once, and only directories modified since the last measurement are read again
+        When caching, the tree has just been stat'ed for self._stamp, so the total found then is used rather than walking it again
+        """
+        if fresh_property.enabled and getattr(self, 'caching', True):
+            if measure := SIZES.measured(self.path):
+                return MemorySize(measure[1])
+        return MemorySize(SIZES(self.path))
+
+    def du(
+        self, top_k: int = None, workers: int = None
+    ) -> Iterator[Usage] | list[Usage]:
+        """
+        The disk usage of self and of every directory beneath it, added up in a single post-order pass
+        Each Usage is yielded as soon as everything beneath its directory has been, and is remembered for Place.usage
+
+        Params
+            top_k:int
+                return a list of the k largest directories, largest first, holding no more than k Usages at a time
+            workers:int
+                threads reading directories before they are added up. None -> one at a time
         """
-        return MemorySize(sum(file.size for file in self.leaves))
+        usages = SIZES.du(self.path, workers)
+        if top_k:
+            return heapq.nlargest(top_k, usages, key=attrgetter('size'))
+        return usages
+
+    @property
+    def usage(self) -> Usage | None:
+        """
+        self's Usage, as found by the last du to pass through self
+        Every directory beneath self is stat'ed first, as for self.size, and if there is no Usage, or the tree has changed since, a new du is run.
+        So this costs a stat per directory even when nothing has changed.
+        filey.handles.SIZES.usage(self.path) reads the remembered Usage without touching the disk, but won't see changes made since
+        """
+        if (usage := SIZES.usage(self.path, validate=True)) is None:
+            for usage in SIZES.du(self.path):
+                pass
+        return usage
+
+    def profile(self, workers: int = None, **kwargs) -> Profile:
+        """
+        Count the files, and bytes, of each mime, kind, and extension in self's tree, walking it once
+        Files are classified by their extensions when filetype recognises only one mime by them,
+        and only the rest have their headers read, on a thread pool.
+        Files are counted in the order they were walked, so each table's labels are in the order they were first seen
+
+        Params
+            workers:int
+                threads reading headers. None -> ThreadPoolExecutor's default, 1 -> read them in this thread
+            kwargs
+                passed to walking.files, eg: exts, max_depth, exclude, ignore
+        """
+        tables = {}, {}, {}
+
+        def count(mime: str | None, ext: str, size: int) -> None:
+            kind = mime and mime.split('/')[0]
+            for table, label in zip(tables, (mime, kind, ext)):
+                files, total = table.get(label, (0, 0))
+                table[label] = files + 1, total + size
+
+        def settle(limit: int) -> None:
+            """
+            Count pending files in order, waiting on the pool once more than limit of them are pending
+            """
+            while pending and (
+                len(pending) > limit or not isinstance(pending[0][0], Future)
+            ):
+                mime, ext, size = pending.popleft()
+                count(mime.result() if isinstance(mime, Future) else mime, ext, size)
+
+        if workers != 1:
+            workers = workers or min(32, (os.cpu_count() or 1) + 4)
+            pool = ThreadPoolExecutor(workers)
+        pending = deque()
+        try:
+            for entry in walking.files(self.path, entries=True, **kwargs):
+                if entry.is_dir:
+                    continue
+                ext, size = os.path.splitext(entry.name)[1], entry.size or 0
+                if not (mime := EXTENSIONS.get(ext.lower())):
+                    if workers == 1:
+                        mime = _sniff(entry.path)
+                    else:
+                        mime = pool.submit(_sniff, entry.path)
+                pending.append((mime, ext, size))
+                settle(4 * workers)
+            settle(0)
+        finally:
+            if workers != 1:
+                pool.shutdown(cancel_futures=True)
+        return Profile(*({k: Share(*v) for k, v in t.items()} for t in tables))
+
+    def snapshot(self, **kwargs) -> Snapshot:
+        """
+        Tabulate self's tree in numpy arrays, for vectorised filters and totals. Requires numpy
+        See snapshots.Snapshot for the details
+
+        Params
+            kwargs
+                passed to walking.walk, eg: max_depth, exclude, ignore
+        """
+        return Snapshot.take(self.path, EXTENSIONS, **kwargs)
+
+    @fresh_property
+    def _profile(self) -> Profile:
+        """
+        self.profile(), as seen by mimes, kinds, and exts
+        """
+        return self.profile()
 
     @property
     def mimes(self) -> tuple[str]:
         """
         Return Thing mimes for all Things from all branches
         """
-        return tuple(
-            unique(
-                filter(
-                    None,
-                    (
-                        File(path).mime
-                        for path in self.gather(dirs=False, absolute=True)
-                    ),
-                )
-            )
-        )
+        return tuple(filter(None, self._profile.mimes))
 
     @property
     def kinds(self) -> tuple[str]:
@@ -754,14 +1257,68 @@ class Place(Thing):
         """
         Return extensions for all Things from all branches
         """
-        return tuple(
-            unique(
-                filter(
-                    None,
-                    (File(path).ext for path in self.gather(dirs=False, absolute=True)),
-                )
-            )
-        )
+        return tuple(filter(None, self._profile.exts))
+
+    def sort(
+        self, key: str = 'name', reverse: bool = False, dirs: bool = False, **kwargs
+    ) -> list[str]:
+        """
+        Every path in self's tree, sorted by data gathered while walking it, so nothing is stat'ed twice
+
+        Params
+            key:str
+                'name', 'path', 'size', or 'mtime'
+            reverse:bool
+                True -> largest/newest/last first
+            dirs:bool
+                True -> include directories
+            kwargs
+                passed to walking.walk, eg: max_depth, exclude, ignore
+        """
+        entries = walking.walk(self.path, dirs=dirs, entries=True, **kwargs)
+        order = lambda entry: getattr(entry, key) or 0
+        return [entry.path for entry in sorted(entries, key=order, reverse=reverse)]
+
+    def top(
+        self,
+        k: int = 10,
+        key: str | Callable = 'size',
+        reverse: bool = False,
+        dirs: bool = False,
+        **kwargs,
+    ) -> list[walking.WalkEntry]:
+        """
+        The k entries in self's tree which rank highest, highest first, found in one walk
+        Only k entries are held onto at a time, and their stat data comes from the walk, so nothing is stat'ed twice
+
+        Params
+            k:int
+                how many entries to return
+            key:str|Callable
+                'name', 'path', 'size', or 'mtime', or a function of a walking.WalkEntry
+            reverse:bool
+                True -> the k which rank lowest, lowest first
+            dirs:bool
+                True -> include directories
+            kwargs
+                passed to walking.walk, eg: max_depth, exclude, ignore
+        """
+        entries = walking.walk(self.path, dirs=dirs, entries=True, **kwargs)
+        order = key if callable(key) else lambda entry: getattr(entry, key) or 0
+        pick = (heapq.nlargest, heapq.nsmallest)[reverse]
+        return pick(k, entries, key=order)
+
+    def largest(self, k: int = 10, **kwargs) -> list[walking.WalkEntry]:
+        """
+        The k largest files in self's tree, largest first. See Place.top
+        """
+        return self.top(k, 'size', **kwargs)
+
+    def newest(self, k: int = 10, **kwargs) -> list[walking.WalkEntry]:
+        """
+        The k most recently modified files in self's tree, newest first. See Place.top
+        """
+        return self.top(k, 'mtime', **kwargs)
 
     @property
     def isroot(self) -> bool:
@@ -780,8 +1337,7 @@ class Place(Thing):
             raise OSError(f"{self.__short_repr} does not exist")
         if not other.exists:
             raise OSError(f"{other.__short_repr} does not exist")
-        new = os.path.join(self.path, os.path.split(other.path)[-1])
-        other.clone(folder=self.up.path) if copy else other.rename(new)
+        other.clone(folder=self.path) if copy else other.move(self.path)
         return self
 
     def enter(self) -> _Place:
@@ -804,27 +1360,29 @@ Directory = Folder = Place
 
 
 class Audio(File):
+    __slots__ = ()
+
     def __init__(self, path: str):
         path = os.path.abspath(shell.trim(path))
         if os.path.isdir(path) or not ft.audio_match(path):
             raise ValueError("Given path corresponds to a directory")
-        super(type(self), self).__init__(path)
+        super().__init__(path)
 
-    @property
+    @fresh_property
     def metadata(self):
         return am.load(self.path)
 
     @property
     def tags(self):
-        self.metadata['tags']
+        return self.metadata['tags']
 
     @property
     def pictures(self):
-        self.metadata['pictures']
+        return self.metadata['pictures']
 
     @property
     def streaminfo(self):
-        self.metadata['streaminfo']
+        return self.metadata['streaminfo']
 
     @property
     def artist(self):
@@ -906,30 +1464,264 @@ class Scanner:
         """
         return re.I if not self.__case else 0
 
+    @property
+    def words(self) -> list[str]:
+        """
+        the separate keywords sought in non-strict mode
+        """
+        return self.__keywords.split()
+
     @property
     def pattern(self):
         """
-        compile the search pattern
+        compile the search pattern, or fetch it from the query cache shared with the walkers
         """
-        return re.compile(
-            ('|'.join(self.keywords.split()), self.keywords)[self.strict], self.case
+        if self.strict:
+            source = self.keywords
+        else:
+            escape = (re.escape, str)[self.prescaped]
+            source = '|'.join(map(escape, self.words))
+        return walking.compile_query(source, case=self.__case, regex=True).terms
+
+    @property
+    def automatic(self) -> bool:
+        """
+        whether or not content is matched by an AhoCorasick automaton rather than a regex alternation
+        only large sets of literal keywords, scanned as text, qualify
+        """
+        return (
+            not (self.strict or self.prescaped or 'b' in self.mode)
+            and len(self.words) >= AUTOMATON
         )
 
+    @property
+    def width(self) -> int | None:
+        """
+        The most a match can span, or None if the keywords are prescaped regex and there is no telling
+        This is counted in encoded bytes, which are never fewer than characters, so it holds in text and binary modes alike
+        """
+        return None if self.prescaped else len(self.__keywords.encode('utf-8'))
+
+    @property
+    def content(self) -> re.Pattern:
+        """
+        The pattern used on files' content. In binary modes this is the bytes version of self.pattern,
+        and for large sets of literal keywords it is an AhoCorasick automaton
+        """
+        if self.automatic:
+            return walking.compile_keywords(tuple(self.words), self.__case)
+        pattern = self.pattern
+        if 'b' in self.mode:
+            flags = pattern.flags & ~re.UNICODE
+            return re.compile(pattern.pattern.encode('utf-8'), flags)
+        return pattern
+
+    def __chunks(self, fob: io.IOBase) -> Iterator[str | bytes]:
+        """
+        Read a file in bounded chunks
+        Each buffer repeats the end of the previous one, so that any match crossing a boundary still appears whole in one buffer.
+        Prescaped keywords can match any length, so their files are read whole
+        """
+        if self.width is None:
+            yield fob.read()
+            return
+        overlap = self.width - 1
+        tail = fob.read(0)
+        while chunk := fob.read(CHUNK):
+            buffer = tail + chunk
+            yield buffer
+            tail = buffer[max(len(buffer) - overlap, 0) :]
+
+    def __mapped(self, fob: io.IOBase) -> mmap.mmap | None:
+        """
+        Memory-map a file opened in a binary mode with the builtin open, if possible
+        """
+        if not ('b' in self.mode and self.opener is open):
+            return None
+        try:
+            return mmap.mmap(fob.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None
+
     def __call__(self, path: str, lines: bool = None) -> bool:
         """
         Scan a file at a given path for a predefined word/clause, you can also override the default lines argument
+        Files are read lazily, line by line or chunk by chunk, and scanning stops at the first match,
+        so memory use does not grow with the size of the file
         """
         if isinstance(lines, type(None)):
             lines = self.lines
+        pattern = self.content
         try:
             with self.opener(path, self.mode) as fob:
-                method = (fob.read, fob.readlines)[lines]
-                return self.pattern.search(path) or any(
-                    map(self.pattern.search, method())
-                )
+                if self.pattern.search(path):
+                    return True
+                if lines:
+                    return any(map(pattern.search, fob))
+                mapped = self.__mapped(fob)
+                if mapped is not None:
+                    with mapped:
+                        return bool(pattern.search(mapped))
+                return any(map(pattern.search, self.__chunks(fob)))
         except UnicodeDecodeError:
             return False
 
+    def binary(self, path: str) -> bool:
+        """
+        Check if a file should be skipped as binary before it is scanned as text
+        Like git, this looks for a null byte near the start of the file.
+        Files opened in 'rb' mode, or with a custom opener, are never considered binary
+        """
+        if 'b' in self.mode or self.opener is not open:
+            return False
+        with open(path, 'rb') as fob:
+            return b'\0' in fob.read(SNIFF)
+
+    def offsets(self, path: str) -> list[tuple[int, int]]:
+        """
+        The (start, end) offsets of every match in a file's content, exactly as finditer would find them in the whole of it
+        The file is read chunk by chunk, or memory-mapped, rather than all at once.
+        Until the file runs out, a match ending within a keyword's width of the end of a buffer may have been cut short by it,
+        so it is held back, and the next buffer starts where it does
+        """
+        pattern = self.content
+        try:
+            with self.opener(path, self.mode) as fob:
+                mapped = self.__mapped(fob)
+                if mapped is not None:
+                    with mapped:
+                        return [match.span() for match in pattern.finditer(mapped)]
+                if self.width is None:
+                    return [match.span() for match in pattern.finditer(fob.read())]
+                overlap = max(self.width - 1, 0)
+                found, offset, tail = [], 0, fob.read(0)
+                while True:
+                    chunk = fob.read(CHUNK)
+                    buffer = tail + chunk
+                    cut = len(buffer) - overlap if chunk else len(buffer)
+                    for match in pattern.finditer(buffer):
+                        if chunk and match.end() >= cut:
+                            cut = min(cut, match.start())
+                            break
+                        found.append((offset + match.start(), offset + match.end()))
+                    if not chunk:
+                        return found
+                    cut = max(cut, 0)
+                    tail, offset = buffer[cut:], offset + cut
+        except UnicodeDecodeError:
+            return []
+
+    def hits(self, path: str) -> set[str]:
+        """
+        Which of the keywords occur in a file's content
+        In strict mode there is only one keyword, the whole clause
+        """
+        words = set((self.words, [self.__keywords])[self.strict])
+        found = set()
+        if self.automatic:
+            search = self.content.hits
+        else:
+            escape = (re.escape, str)[self.prescaped]
+            patterns = {w: re.compile(escape(w), self.case) for w in words}
+            if 'b' in self.mode:
+                patterns = {
+                    w: re.compile(p.pattern.encode('utf-8'), p.flags & ~re.UNICODE)
+                    for w, p in patterns.items()
+                }
+            search = lambda buffer: {w for w, p in patterns.items() if p.search(buffer)}
+        try:
+            with self.opener(path, self.mode) as fob:
+                for buffer in self.__chunks(fob):
+                    found |= search(buffer)
+                    if len(found) == len(words):
+                        break
+        except UnicodeDecodeError:
+            pass
+        return found
+
+    def scan_tree(
+        self,
+        place: _Placestr,
+        workers: int = None,
+        offsets: bool = False,
+        ordered: bool = False,
+        batch: int = 64,
+        **kwargs,
+    ) -> Iterator[str | tuple[str, list[tuple[int, int]]]]:
+        """
+        Scan every file under a directory on a pool of processes, yielding the paths of those which match
+        Paths are streamed from the walker to the pool in batches, with no more than 2*workers batches in flight.
+        Binary files are skipped in text mode, as are files which can't be read.
+        The scanner must be picklable, so a custom opener has to be defined at module level
+
+        Params
+            place
+                the directory to scan
+            workers
+                number of processes. None -> one per core, 1 -> scan in this process
+            offsets
+                True -> yield (path, [(start, end), ...]) pairs locating each match in the file's content.
+                        Files whose names match have an empty list if their content doesn't
+            ordered
+                True -> yield in the walker's order
+                False -> yield each batch's results as soon as they are ready
+            batch
+                number of paths handed to a process at a time
+            kwargs
+                passed to walking.files, eg: exts, max_depth, exclude, ignore
+        """
+        paths = walking.files(str(place), **kwargs)
+        batches = iter(lambda: [*islice(paths, batch)], [])
+        if workers == 1:
+            for chunk in batches:
+                yield from _grep(self, chunk, offsets)
+            return
+        workers = workers or os.cpu_count()
+        pool = ProcessPoolExecutor(workers)
+        running = deque()
+
+        def drain():
+            if ordered:
+                done = [running.popleft()]
+            else:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.remove(future)
+            for future in done:
+                yield from future.result()
+
+        try:
+            for chunk in batches:
+                running.append(pool.submit(_grep, self, chunk, offsets))
+                if len(running) >= 2 * workers:
+                    yield from drain()
+            while running:
+                yield from drain()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _grep(
+    scanner: Scanner, paths: list[str], offsets: bool
+) -> list[str | tuple[str, list[tuple[int, int]]]]:
+    """
+    Scan a batch of files on behalf of Scanner.scan_tree
+    """
+    found = []
+    for path in paths:
+        try:
+            if scanner.binary(path):
+                continue
+            if offsets:
+                spans = scanner.offsets(path)
+                if spans or scanner.pattern.search(path):
+                    found.append((path, spans))
+            elif scanner(path):
+                found.append(path)
+        except OSError:
+            continue
+    return found
+
 
 if __name__ == '__main__':
     # show(locals().keys())
@@ -0,0 +1,762 @@
+"""
+Persistent indexes of directory trees
+
+A TreeIndex keeps the path, name, extension, size, and date modified of everything under a root in an SQLite database.
+Refreshing only re-reads the directories whose modification times have changed since the last refresh,
+and queries take the same arguments as walking.search without walking the tree.
+A TrigramIndex answers fuzzy queries, ranking names by their similarity to what you remember of them.
+A SizeCache keeps the total size of each directory's files in memory, so that measuring an unchanged tree again only costs a stat per directory.
+It also rolls those totals up into the cumulative usage of every directory in a tree, as du does.
+
+Caveat
+    A file which is rewritten in place does not change its directory's modification time,
+    so its size and mtime are only updated once something else in that directory changes.
+    The same goes for the totals of a SizeCache.
+"""
+__all__ = "TreeIndex TrigramIndex SizeCache".split()
+
+from typing import Iterator, Iterable, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from collections import Counter
+import bisect, hashlib, os, re, sqlite3
+
+from . import walking
+
+
+CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'filey')
+
+# fuzzy lookups merge a trigram's posting list into the candidates while it is at most MERGE times their number,
+# and scan the remaining lists in bulk, rather than bisecting them per candidate, when a bisection costs about PROBE times as much as a scanned item
+MERGE = 2
+PROBE = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    isdir INTEGER NOT NULL,
+    size INTEGER,
+    mtime INTEGER,
+    plain INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent);
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL
+);
+"""
+
+
+def _plain(string: str) -> bool:
+    """
+    Check if SQL's LIKE operator can be trusted to agree with re.I on a string
+    """
+    return string.isascii() and not '\n' in string
+
+
+def _like(string: str) -> str:
+    """
+    Escape a string for use inside of a LIKE pattern
+    """
+    return re.sub(r'([\\%_])', r'\\\1', string)
+
+
+def _row(
+    path: str, parent: str, name: str, descend: bool, stat: os.stat_result
+) -> tuple:
+    """
+    Format a row of the entries table
+    """
+    return (
+        path,
+        parent,
+        name,
+        '' if descend else os.path.splitext(name)[1].lower(),
+        descend,
+        stat.st_size if stat else None,
+        stat.st_mtime_ns if stat else None,
+        _plain(path),
+    )
+
+
+class TreeIndex:
+    """
+    An on-disk index of a directory's tree which can be searched without walking it
+
+    example
+        >>> music = TreeIndex('~/music').refresh()
+        >>> [*music('alix perez', exts='mp3 flac')]
+    """
+
+    def __init__(self, root: str = '.', path: str = None):
+        """
+        params:
+            root
+                the directory whose tree will be indexed
+            path
+                location of the database. Defaults to a file under ~/.cache/filey named after the root
+        """
+        self.root = os.path.realpath(os.path.expanduser(str(root)))
+        if not path:
+            os.makedirs(CACHE, exist_ok=True)
+            digest = hashlib.sha1(self.root.encode('utf-8', 'surrogateescape'))
+            path = os.path.join(CACHE, digest.hexdigest() + '.sqlite')
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        return f"TreeIndex(root={self.root}, entries={len(self)})"
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _subtree(self, path: str) -> tuple[str, str, str]:
+        """
+        Arguments selecting a path and everything beneath it, for use with "path = ? OR path > ? AND path < ?"
+        """
+        return path, path + os.sep, path + chr(ord(os.sep) + 1)
+
+    def _forget(self, path: str) -> None:
+        """
+        Remove a path and everything beneath it from the index
+        """
+        bounds = self._subtree(path)
+        clause = "WHERE path = ? OR (path > ? AND path < ?)"
+        self.connection.execute(f"DELETE FROM entries {clause}", bounds)
+        self.connection.execute(f"DELETE FROM folders {clause}", bounds)
+
+    def _relist(self, folder: str, mtime: int) -> None:
+        """
+        Replace the index's record of a directory's immediate content
+        """
+        listing = walking._listing(folder)
+        new = {entry.path: descend for entry, descend in listing}
+        old = self.connection.execute(
+            "SELECT path, isdir FROM entries WHERE parent = ?", (folder,)
+        ).fetchall()
+        for path, isdir in old:
+            if not path in new or isdir and not new[path]:
+                self._forget(path)
+        rows = []
+        for entry, descend in listing:
+            try:
+                stat = entry.stat()
+            except OSError:
+                stat = None
+            rows.append(_row(entry.path, folder, entry.name, descend, stat))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO folders VALUES (?, ?)", (folder, mtime)
+        )
+
+    def refresh(self, path: str = None) -> "TreeIndex":
+        """
+        Bring the index up to date
+        Every directory is stat'ed, but only those whose modification time has changed are read again
+        Params
+            path
+                limit the refresh to the subtree rooted here. Defaults to the index's root
+        """
+        top = os.path.realpath(str(path)) if path else self.root
+        stamps = dict(self.connection.execute("SELECT path, mtime FROM folders"))
+        stack = [top]
+        with self.connection:
+            while stack:
+                folder = stack.pop()
+                try:
+                    mtime = os.stat(folder).st_mtime_ns
+                    if stamps.get(folder) != mtime:
+                        self._relist(folder, mtime)
+                except (FileNotFoundError, NotADirectoryError):
+                    self._forget(folder)
+                    continue
+                stack.extend(
+                    row[0]
+                    for row in self.connection.execute(
+                        "SELECT path FROM entries WHERE parent = ? AND isdir = 1",
+                        (folder,),
+                    )
+                )
+        return self
+
+    def update(self, path: str) -> "TreeIndex":
+        """
+        Re-index a single path, and refresh everything beneath it if it is a directory
+        Paths which no longer exist are forgotten
+        """
+        parent, name = os.path.split(path)
+        if not os.path.lexists(path):
+            return self.forget(path)
+        descend = os.path.isdir(path) and not name.lower() in walking.LOCKOUTS
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        with self.connection:
+            if not descend:
+                self._forget(path)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                _row(path, parent, name, descend, stat),
+            )
+        return self.refresh(path) if descend else self
+
+    def forget(self, path: str) -> "TreeIndex":
+        """
+        Remove a path, and everything beneath it, from the index
+        """
+        with self.connection:
+            self._forget(path)
+        return self
+
+    def move(self, source: str, dest: str) -> "TreeIndex":
+        """
+        Record that source has been renamed to dest
+        Everything beneath source is re-keyed in place rather than read from the disk again
+        """
+        _, low, high = self._subtree(source)
+        start = len(source) + 1
+        with self.connection:
+            self._forget(dest)
+            self.connection.execute(
+                "UPDATE entries SET path = ? || substr(path, ?), plain = plain AND ?"
+                " WHERE path > ? AND path < ?",
+                (dest, start, _plain(dest), low, high),
+            )
+            self.connection.execute(
+                "UPDATE folders SET path = ? || substr(path, ?) WHERE path > ? AND path < ?",
+                (dest, start, low, high),
+            )
+            self.connection.execute(
+                "UPDATE entries SET parent = ? || substr(parent, ?)"
+                " WHERE parent = ? OR (parent > ? AND parent < ?)",
+                (dest, start, source, low, high),
+            )
+            self.connection.execute(
+                "UPDATE folders SET path = ? WHERE path = ?", (dest, source)
+            )
+            self.connection.execute("DELETE FROM entries WHERE path = ?", (source,))
+        return self.update(dest)
+
+    def paths(self, dirs: int = 0) -> Iterator[str]:
+        """
+        Every indexed path
+        Params
+            dirs
+                0 -> ignore all directories
+                1 -> directories and files
+                2 -> directories only
+        """
+        where = {0: "WHERE isdir = 0", 1: "", 2: "WHERE isdir = 1"}[dirs]
+        for (path,) in self.connection.execute(f"SELECT path FROM entries {where}"):
+            yield path
+
+    def __call__(
+        self,
+        terms: str,
+        exts: str = '',
+        case: bool = False,
+        negative: bool = False,
+        dirs: int = 0,
+        strict: int = 1,
+        regex: bool = False,
+        names: bool = True,
+    ) -> Iterator[str]:
+        """
+        Find indexed paths matching the given terms/criteria
+        Takes the same arguments, and gives the same answers, as walking.search
+        Whenever LIKE can safely rule rows out, SQLite narrows the candidates before any regex is run
+
+        Params
+            terms
+                the terms sought after
+            exts
+                any file extensions you wish to check for
+                separate by spaces
+            case
+                toggle case sensitivity
+            negative
+                Any files/folders with names or extensions matching the terms and exts will be omitted.
+            dirs
+                0 -> ignore all directories
+                1 -> directories and files
+                2 -> directories only
+            strict
+                0 -> match any terms in any order
+                1 -> match all terms in any order (interruptions allowed)
+                2 -> match all terms in any order (no interruptions allowed)
+                3 -> match all terms in given order (interruptions)
+                4 -> match all terms in given order (no interruptions)
+                combinations of the following are not counted as interruptions:
+                    [' ', '_', '-']
+                5 -> match string will be compiled as though it was preformatted regex
+            names
+                True -> only yield results whose names match
+                False -> yield results who match at any level
+        """
+        clauses = [{0: "isdir = 0", 1: "1", 2: "isdir = 1"}[dirs]]
+        params = []
+        words = terms.split() if isinstance(terms, str) else list(terms)
+        if (
+            strict < 3
+            and words
+            and all(map(str.isascii, words))
+            and not (negative or regex)
+        ):
+            column = ('path', 'name')[names]
+            likes = [f"{column} LIKE ? ESCAPE '\\'"] * len(words)
+            joint = (' AND ', ' OR ')[strict == 0]
+            clauses.append(f"(plain = 0 OR {joint.join(likes)})")
+            params.extend(f"%{_like(word)}%" for word in words)
+        pat = walking.compile_query(exts=exts).exts
+        suffixes = getattr(pat, 'suffixes', ())
+        if dirs == 0 and suffixes and all(map(str.isascii, suffixes)) and not negative:
+            likes = ["name LIKE ? ESCAPE '\\'"] * len(suffixes)
+            clauses.append(f"(plain = 0 OR {' OR '.join(likes)})")
+            params.extend(f"%{_like(suffix)}" for suffix in suffixes)
+        rows = self.connection.execute(
+            f"SELECT path FROM entries WHERE {' AND '.join(clauses)}", params
+        )
+        candidates = (row[0] for row in rows)
+        if dirs == 0:
+            candidates = (i for i in candidates if bool(pat.search(i)) != negative)
+        yield from walking.search_iter(
+            candidates,
+            terms=terms,
+            exts=exts,
+            case=case,
+            negative=negative,
+            dirs=dirs,
+            strict=strict,
+            regex=regex,
+            names=names,
+        )
+
+    search = __call__
+
+
+class Tally(NamedTuple):
+    """
+    What a SizeCache knows about a single directory
+        mtime
+            the directory's modification time when it was read
+        device, inode
+            identify the directory, so that it is only counted once however many ways it can be reached
+        total
+            the sum of sizes of the directory's files which have no other hard links
+        files
+            the number of files in the directory
+        newest
+            the latest modification time of the directory and its files
+        linked
+            (device, inode, size) for each of the directory's files which do
+        folders
+            the paths of the directory's subdirectories
+    """
+
+    mtime: int
+    device: int
+    inode: int
+    total: int
+    files: int
+    newest: int
+    linked: tuple[tuple[int, int, int]]
+    folders: tuple[str]
+
+
+class Usage(NamedTuple):
+    """
+    How much of the disk a directory takes up, counting everything beneath it
+        path
+            the directory's path
+        size
+            bytes in files. Files with several hard links are counted in the first directory du meets them in
+        files
+            the number of files
+        newest
+            the latest date modified, in seconds since the epoch, of the directory or anything beneath it
+    """
+
+    path: str
+    size: int
+    files: int
+    newest: float
+
+
+class SizeCache:
+    """
+    Measure directory trees, remembering each directory's total until its modification time changes
+
+    example
+        >>> sizes = SizeCache()
+        >>> sizes('~/music')  # reads every directory
+        >>> sizes('~/music')  # only stats them
+    """
+
+    def __init__(self):
+        self.tallies = {}
+        self.usages = {}
+        self.measures = {}
+
+    def __repr__(self):
+        return f"SizeCache(folders={len(self)})"
+
+    def __len__(self):
+        return len(self.tallies)
+
+    def clear(self) -> None:
+        self.tallies.clear()
+        self.usages.clear()
+        self.measures.clear()
+
+    def _read(self, folder: str, stat: os.stat_result) -> Tally:
+        """
+        List a directory and tally its files
+        Locked out directories are counted like files, as they are by walking.files, and symlinks to files count as themselves, as they do for du
+        """
+        total, files, newest, linked, folders = 0, 0, stat.st_mtime_ns, [], []
+        for entry, descend in walking._listing(folder):
+            if descend:
+                folders.append(entry.path)
+                continue
+            try:
+                info = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if info.st_nlink > 1:
+                linked.append((info.st_dev, info.st_ino, info.st_size))
+            else:
+                total += info.st_size
+            files += 1
+            newest = max(newest, info.st_mtime_ns)
+        device, inode, mtime = stat.st_dev, stat.st_ino, stat.st_mtime_ns
+        linked, folders = (*linked,), (*folders,)
+        return Tally(mtime, device, inode, total, files, newest, linked, folders)
+
+    def _stale(self, folder: str) -> None:
+        """
+        Drop the usages, and measures, of a directory and its ancestors, which no longer add up
+        """
+        while True:
+            self.usages.pop(folder, None)
+            self.measures.pop(folder, None)
+            folder, tail = os.path.split(folder)
+            if not tail:
+                break
+
+    def _forget(self, folder: str) -> None:
+        """
+        Drop the tallies, and usages, of a directory and everything beneath it
+        """
+        self._stale(folder)
+        stack = [folder]
+        while stack:
+            self.usages.pop(path := stack.pop(), None)
+            self.measures.pop(path, None)
+            if tally := self.tallies.pop(path, None):
+                stack.extend(tally.folders)
+
+    def tally(self, folder: str) -> Tally | None:
+        """
+        Get a directory's tally, reading it again only if it has changed since it was last read
+        Returns None if the directory cannot be read
+        """
+        tally = old = self.tallies.get(folder)
+        try:
+            stat = os.stat(folder)
+            if old is None or old.mtime != stat.st_mtime_ns:
+                tally = self._read(folder, stat)
+        except OSError:
+            self._forget(folder)
+            return None
+        if old and tally is not old:
+            self._stale(folder)
+            for path in set(old.folders).difference(tally.folders):
+                self._forget(path)
+        self.tallies[folder] = tally
+        return tally
+
+    def _tallies(self, root: str, workers: int = None) -> Iterator[tuple[str, Tally]]:
+        """
+        Bring the tallies of a directory's tree up to date, yielding (folder, tally) once per distinct directory
+        The tree is read a level at a time, on a thread pool if more than one worker is asked for
+        """
+        pool = ThreadPoolExecutor(workers) if workers and workers > 1 else None
+        mapper = pool.map if pool else map
+        seen, level = set(), [os.path.realpath(os.path.expanduser(str(root)))]
+        try:
+            while level:
+                pairs, level = zip(level, mapper(self.tally, level)), []
+                for folder, tally in pairs:
+                    if tally is None or (tally.device, tally.inode) in seen:
+                        continue
+                    seen.add((tally.device, tally.inode))
+                    level.extend(tally.folders)
+                    yield folder, tally
+        finally:
+            if pool:
+                pool.shutdown()
+
+    def __call__(self, root: str = '.', workers: int = None) -> int:
+        """
+        The total size, in bytes, of every file beneath a directory
+        Files with several hard links, and directories reachable by several paths, are only counted once
+        Params
+            root
+                the directory to measure
+            workers
+                the number of threads with which to stat and read directories. None -> one at a time
+        """
+        return self.measure(root, workers)[1]
+
+    def stamp(self, root: str = '.', workers: int = None) -> int:
+        """
+        A fingerprint of the modification times of every directory beneath a root
+        It changes whenever anything is added to, removed from, or renamed within the tree
+        """
+        return self.measure(root, workers)[0]
+
+    def measure(self, root: str = '.', workers: int = None) -> tuple[int, int]:
+        """
+        The stamp and the total size of a directory's tree, from a single pass over it
+        The pair is remembered, for self.measured, until this cache sees a change beneath the root
+        """
+        root = os.path.realpath(os.path.expanduser(str(root)))
+        total, linked, mtimes = 0, {}, []
+        for folder, tally in self._tallies(root, workers):
+            total += tally.total
+            linked.update(((d, i), size) for d, i, size in tally.linked)
+            mtimes.append((folder, tally.mtime))
+        pair = self.measures[root] = hash((*mtimes,)), total + sum(linked.values())
+        return pair
+
+    def measured(self, root: str) -> tuple[int, int] | None:
+        """
+        The stamp and total found for a directory by the last measure of it, without touching the disk. None if there isn't one
+        """
+        return self.measures.get(os.path.realpath(os.path.expanduser(str(root))))
+
+    def du(self, root: str = '.', workers: int = None) -> Iterator[Usage]:
+        """
+        Yield the Usage of every directory beneath a root, and of the root itself, in post-order
+        Each directory is yielded as soon as everything beneath it has been, and is remembered for self.usage
+        Params
+            root
+                the directory to measure
+            workers
+                the number of threads with which to stat and read directories before they are added up. None -> one at a time
+        """
+        root = os.path.realpath(os.path.expanduser(str(root)))
+        if workers and workers > 1:
+            for pair in self._tallies(root, workers):
+                pass
+        seen, linked, stack = set(), set(), []
+
+        def enter(folder: str) -> list | None:
+            tally = self.tally(folder)
+            if tally is None or (tally.device, tally.inode) in seen:
+                return None
+            seen.add((tally.device, tally.inode))
+            size = tally.total
+            for device, inode, length in tally.linked:
+                if not (device, inode) in linked:
+                    linked.add((device, inode))
+                    size += length
+            return [folder, size, tally.files, tally.newest, iter(tally.folders)]
+
+        if frame := enter(root):
+            stack.append(frame)
+        while stack:
+            folder, size, files, newest, folders = stack[-1]
+            if (child := next(folders, None)) is not None:
+                if sub := enter(child):
+                    stack.append(sub)
+                continue
+            stack.pop()
+            usage = self.usages[folder] = Usage(folder, size, files, newest / 1e9)
+            if stack:
+                parent = stack[-1]
+                parent[1] += size
+                parent[2] += files
+                parent[3] = max(parent[3], newest)
+            yield usage
+
+    def usage(self, folder: str, validate: bool = False) -> Usage | None:
+        """
+        The Usage found for a directory by the last du to pass through it
+        Usages are dropped as soon as this cache sees a change beneath them. None if there isn't one
+        Params
+            validate
+                True -> stat every directory beneath folder first, so that changes made since are seen
+                False -> don't touch the disk
+        """
+        folder = os.path.realpath(os.path.expanduser(str(folder)))
+        if validate:
+            for pair in self._tallies(folder):
+                pass
+        return self.usages.get(folder)
+
+
+WORD = re.compile(r'[^\W_]+')
+
+
+def _trigrams(string: str) -> set[str]:
+    """
+    The casefolded trigrams of each word in a string. Words are padded so that their edges count for more
+    """
+    grams = set()
+    for word in WORD.findall(string.casefold()):
+        word = f"  {word} "
+        grams.update(word[i : i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def _contains(posting: array, item: int) -> bool:
+    """
+    Check if a sorted posting list contains an item
+    """
+    i = bisect.bisect_left(posting, item)
+    return i < len(posting) and posting[i] == item
+
+
+class TrigramIndex:
+    """
+    An in-memory index of names for fuzzy, ranked searches
+    Names are broken into trigrams, and matches are ranked by the proportion of trigrams they share with the query.
+    Candidates are drawn from the query's rarest trigrams first,
+    and the search stops as soon as no unseen name could outrank the k best so far,
+    so a typical lookup never touches most of the index
+
+    example
+        >>> music = TrigramIndex(TreeIndex('~/music').refresh().paths())
+        >>> [*music('alix peres recal', k=5)]
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        """
+        params:
+            paths
+                the paths to index. Only their names are broken into trigrams
+        """
+        self.paths = []
+        self.sizes = array('I')
+        self.postings = {}
+        for path in paths:
+            self.add(path)
+
+    def __repr__(self):
+        return f"TrigramIndex(paths={len(self)}, trigrams={len(self.postings)})"
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path: str) -> None:
+        """
+        Index one more path
+        """
+        key = len(self.paths)
+        grams = _trigrams(os.path.split(path)[1])
+        self.paths.append(path)
+        self.sizes.append(len(grams))
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array('I')
+            posting.append(key)
+
+    def rank(
+        self, terms: str, k: int = 10, exts: str = '', threshold: float = 0.3
+    ) -> list[tuple[float, str]]:
+        """
+        The k paths whose names are most similar to the terms, as (similarity, path) pairs, best first
+        Similarity is the Jaccard index of the trigram sets, so it lies in (0, 1]
+        Params
+            terms
+                what you remember of the name
+            k
+                the number of results
+            exts
+                any file extensions you wish to limit the results to
+            threshold
+                the least similarity worth returning. Lower thresholds can make typos much slower to look up
+        """
+        grams = _trigrams(terms)
+        n = len(grams)
+        if not (n and k > 0):
+            return []
+        empty = array('I')
+        lists = sorted((self.postings.get(gram, empty) for gram in grams), key=len)
+        pat = walking.compile_query(exts=exts).exts if exts else None
+        scope = (str, lambda x: os.path.split(x)[1])[isinstance(pat, walking.Suffixes)]
+        scores = {}
+        counts = Counter(lists[0])
+        best = []
+        floor = threshold
+        for m in range(1, n + 1):
+            if m < n and len(lists[m]) <= MERGE * len(counts):
+                counts.update(lists[m])
+                continue
+            rest = lists[m:]
+            r = len(rest)
+            pending = []
+            for key, shared in counts.most_common():
+                if (shared + r) / n < floor:
+                    break
+                if key in scores:
+                    continue
+                size = self.sizes[key]
+                ceiling = min(shared + r, size)
+                if ceiling / (n + size - ceiling) >= floor:
+                    pending.append((key, shared, size))
+            if len(pending) * r * PROBE > sum(map(len, rest)):
+                keys = {key for key, shared, size in pending}
+                extra = Counter()
+                for posting in rest:
+                    extra.update(keys.intersection(posting))
+                found = extra.__getitem__
+            else:
+                found = lambda key: sum(_contains(posting, key) for posting in rest)
+            for key, shared, size in pending:
+                ceiling = min(shared + r, size)
+                if ceiling / (n + size - ceiling) < floor:
+                    continue
+                path = self.paths[key]
+                if pat and not pat.search(scope(path)):
+                    scores[key] = None
+                    continue
+                shared += found(key)
+                scores[key] = similarity = shared / (n + size - shared)
+                if similarity >= floor:
+                    bisect.insort(best, (-similarity, path))
+                    del best[k:]
+                    if len(best) == k:
+                        floor = max(threshold, -best[-1][0])
+            if m == n or r / n < floor:
+                break
+            counts.update(lists[m])
+        return [(-similarity, path) for similarity, path in best]
+
+    def __call__(
+        self, terms: str, k: int = 10, exts: str = '', threshold: float = 0.3
+    ) -> Iterator[str]:
+        """
+        Yield the k paths whose names are most similar to the terms, best first
+        Takes the same arguments as self.rank
+        """
+        for similarity, path in self.rank(terms, k, exts, threshold):
+            yield path
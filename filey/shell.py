@@ -1,15 +1,30 @@
 # __all__ = "discard unarchive create_enter audio_or_video NameSpacer namespacer isempty move send2trash ffplay trim move_file delevel convert cat".split()
-__all__ = "mcd mv move_file rm ffplay convert cat".split()
+__all__ = "mcd mv move_file copy_file copy_tree rm ffplay convert cat".split()
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from itertools import filterfalse
-from typing import Iterable, Iterator
+from typing import Iterable
 from warnings import warn
-import os, subprocess, sys, time
+import errno, os, shutil, subprocess, sys, time
 
 from send2trash import send2trash
 from sl4ng import shuffle, flat
 import filetype as ft, audio_metadata as am, pyperclip as pc
 
+BUFFER = 1 << 20  # bytes copied at a time when the kernel can't copy a file by itself
+SPAN = 1 << 30  # bytes the kernel is asked to copy at a time
+REFUSALS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EBADF,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.ENOTSOCK,
+    errno.ETXTBSY,
+}  # errors meaning that a zero-copy method doesn't work for a pair of files, rather than that copying failed
+
 
 def delevel(path: str, steps: int = 1) -> str:
     """
@@ -154,7 +169,7 @@ def move(source: str, dest: str, make_dest: bool = False) -> str:
             path to original file/folder
         dest
             path to new containing directory.
-            This will assume that the directory is on the same disk as os.getcwd()
+            If it's on another device, source is copied there, with its symbolic links recreated rather than followed, and then removed
         make_dest
             create destination if it doesn't already exist
     """
@@ -165,30 +180,174 @@ def move(source: str, dest: str, make_dest: bool = False) -> str:
         os.makedirs(dest, exist_ok=True)
     root, name = os.path.split(source)
     new = os.path.join(dest, name)
-    os.rename(source, new)
+    try:
+        os.rename(source, new)
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            raise
+        if os.path.isdir(source) and not os.path.islink(source):
+            copy_tree(source, new)
+            shutil.rmtree(source)
+            return new
+        copy = (copy_file, _copy_link)[os.path.islink(source)]
+        try:
+            copy(source, new)
+        except BaseException:
+            if os.path.lexists(new):
+                os.remove(new)
+            raise
+        os.remove(source)
     return new
 
 
 mv = move
 
 
+def _transfer(source: int, dest: int, size: int) -> None:
+    """
+    Copy everything from one file descriptor's position onwards into another
+    The kernel is asked to do it with os.copy_file_range, or else os.sendfile, so that the bytes needn't pass through Python.
+    Whatever they refuse is copied through a buffer of fixed size. Empty files are always copied through the buffer,
+    because files like those in /proc report a size of 0 but aren't empty.
+    A method which copies nothing from a file that isn't empty has refused too, as copy_file_range does on some filesystems
+    """
+    methods = [
+        lambda: os.copy_file_range(source, dest, SPAN),
+        lambda: os.sendfile(dest, source, None, SPAN),
+    ]
+    if size:
+        for method, name in zip(methods, ('copy_file_range', 'sendfile')):
+            if not hasattr(os, name):
+                continue
+            try:
+                if method():
+                    while method():
+                        pass
+                    return
+            except OSError as error:
+                if not error.errno in REFUSALS:
+                    raise
+    buffer = memoryview(bytearray(BUFFER))
+    while length := os.readv(source, [buffer]):
+        written = 0
+        while written < length:
+            written += os.write(dest, buffer[written:length])
+
+
+def copy_file(source: str, dest: str, metadata: bool = True) -> str:
+    """
+    Copy a file, using the same amount of memory however large it is
+    Return path to the copy
+
+    Params
+        source
+            path to the original file
+        dest
+            path to the copy, or to the directory it should go in
+        metadata
+            copy the permission bits, timestamps, and flags as well, as shutil.copy2 does
+    """
+    if os.path.isdir(dest):
+        dest = os.path.join(dest, os.path.basename(source))
+    if os.path.exists(dest) and os.path.samefile(source, dest):
+        raise shutil.SameFileError(f"{source!r} and {dest!r} are the same file")
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        _transfer(src.fileno(), dst.fileno(), os.fstat(src.fileno()).st_size)
+    if metadata:
+        shutil.copystat(source, dest)
+    return dest
+
+
+def _copy_link(source: str, dest: str, metadata: bool = True) -> str:
+    """
+    Recreate a symbolic link, pointing wherever the original does, even if nothing is there
+    Return path to the copy
+    """
+    link = os.readlink(source)
+    os.symlink(link, dest, target_is_directory=os.path.isdir(source))
+    if metadata:
+        shutil.copystat(source, dest, follow_symlinks=False)
+    return dest
+
+
+def copy_tree(
+    source: str, dest: str, metadata: bool = True, workers: int = None
+) -> str:
+    """
+    Copy a directory and everything beneath it with copy_file, several files at a time
+    Symbolic links are recreated rather than followed, and if anything can't be copied, the partial copy is removed
+    Return path to the copy
+
+    Params
+        source
+            path to the original directory
+        dest
+            path to the copy, which mustn't exist yet
+        metadata
+            copy the permission bits, timestamps, and flags as well, as shutil.copytree does
+        workers
+            number of files copied concurrently. None -> ThreadPoolExecutor's default, 1 -> one at a time
+    """
+    os.makedirs(dest)
+    folders, pending = [(source, dest)], deque()
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    pool = ThreadPoolExecutor(workers) if workers != 1 else None
+    limit = 4 * workers
+    try:
+        stack = [(source, dest)]
+        while stack:
+            folder, copy = stack.pop()
+            with os.scandir(folder) as entries:
+                entries = [*entries]
+            for entry in entries:
+                target = os.path.join(copy, entry.name)
+                if entry.is_symlink():
+                    _copy_link(entry.path, target, metadata)
+                elif entry.is_dir():
+                    os.mkdir(target)
+                    folders.append((entry.path, target))
+                    stack.append((entry.path, target))
+                elif pool:
+                    pending.append(pool.submit(copy_file, entry.path, target, metadata))
+                    while len(pending) > limit:
+                        pending.popleft().result()
+                else:
+                    copy_file(entry.path, target, metadata)
+        for future in pending:
+            future.result()
+        if metadata:
+            for original, copy in reversed(folders):
+                shutil.copystat(original, copy)
+    except BaseException:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        shutil.rmtree(dest, ignore_errors=True)
+        raise
+    finally:
+        if pool:
+            pool.shutdown()
+    return dest
+
+
 def move_file(
     file: str, dest: str, make_dest: bool = False, clone: bool = False
 ) -> str:
     """
     Move a file to a given directory
-    This uses iteration to copy the file byte by byte.
+    This copies the file with copy_file, in constant memory, and then removes the original.
         Use filey.operations.move unless you're having some permission issues
     Params
-        source
-            path to original file/folder
+        file
+            path to original file
         dest
             path to new containing directory.
             This will assume that the directory is on the same disk as os.getcwd()
         make_dest
             create destination if it doesn't already exist
+        clone
+            keep the original
     """
-    if os.path.isdir(source):
+    if os.path.isdir(file):
         raise ValueError(f"Source path points to a directory")
 
     dest = (os.path.realpath, str)[os.path.isabs(dest)](dest)
@@ -198,12 +357,8 @@ def move_file(
         else:
             os.makedirs(dest, exist_ok=True)
 
-    root, name = os.path.split(path)
-    new = os.path.join(dest, name)
-
-    with open(source, 'rb') as src:
-        with open(new, 'wb') as dst:
-            dst.write(src.read())
+    root, name = os.path.split(file)
+    new = copy_file(file, os.path.join(dest, name))
     try:
         None if clone else os.remove(file)
     except PermissionError:
@@ -0,0 +1,316 @@
+"""
+Columnar snapshots of directory trees, for capacity reports
+
+A Snapshot walks a tree once and keeps what it found in numpy arrays, one row per path,
+so that filters and group-by totals over millions of entries run as vectorised operations rather than Python loops.
+Each column is a separate contiguous array, and snapshots are saved as a folder of .npy files, one per array,
+which can be loaded again as memory maps.
+numpy is only needed by this module, and is imported when a snapshot is first taken or loaded.
+
+example
+    >>> snap = Snapshot.take('~/music')
+    >>> snap.paths(snap.select(min_size=1 << 30))  # files over 1 GiB
+    >>> snap.totals('ext')  # files and bytes per extension
+"""
+
+__all__ = "Snapshot".split()
+
+from typing import Iterable
+from array import array
+import os
+
+from . import walking
+
+COLUMNS = {
+    'parent': '<i8',
+    'size': '<i8',
+    'mtime': '<f8',
+    'ext': '<i4',
+    'kind': '<i4',
+    'dir': '?',
+}
+
+
+def _numpy():
+    """
+    Import numpy, which filey doesn't otherwise need
+    """
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("Snapshots need numpy, try: pip install numpy") from error
+    return numpy
+
+
+class Snapshot:
+    """
+    A table of everything under a directory at the time it was taken
+        columns
+            arrays with one row per path, also available as snapshot[column]. A path's id is its row number
+                parent
+                    the id of the containing directory, or -1 for the root's own content
+                size, mtime
+                    as os.stat reports them. -1 and nan if the stat failed
+                ext
+                    the id of the lower cased extension in self.exts. Directories have "", whose id is 0
+                kind
+                    the id in self.kinds of the type of the mime associated with the extension, eg "image". "" if there is none
+                dir
+                    whether or not the path is a directory
+        names, offsets
+            every name, encoded and concatenated, and where each one starts and ends
+        exts, kinds
+            the vocabularies which the ext and kind columns index into
+    """
+
+    def __init__(self, root: str, columns: dict, names, offsets, exts, kinds):
+        self.root = root
+        self.columns = columns
+        self.names = names
+        self.offsets = offsets
+        self.exts = exts
+        self.kinds = kinds
+
+    def __repr__(self):
+        return f"Snapshot(root={self.root}, entries={len(self)})"
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, column: str) -> "numpy.ndarray":
+        return self.columns[column]
+
+    @classmethod
+    def take(
+        cls, root: str = '.', mimes: dict[str, str] = None, **kwargs
+    ) -> "Snapshot":
+        """
+        Walk a tree and tabulate it
+        Params
+            root
+                the directory to snapshot
+            mimes
+                maps lower cased extensions, eg ".png", to mimes, as handles.EXTENSIONS does. Their types fill the kind column
+            kwargs
+                passed to walking.walk, eg: max_depth, exclude, ignore
+        """
+        np = _numpy()
+        root = os.path.realpath(os.path.expanduser(str(root)))
+        mimes = mimes or {}
+        folders, exts = {root: -1}, {'': 0}
+        parents, sizes, mtimes, extids, isdirs = (
+            array('q'),
+            array('q'),
+            array('d'),
+            array('i'),
+            array('b'),
+        )
+        names, offsets = bytearray(), array('q', [0])
+        entries = walking.walk(root, dirs=True, entries=True, **kwargs)
+        for i, entry in enumerate(entries):
+            if entry.is_dir:
+                folders[entry.path] = i
+                ext = ''
+            else:
+                ext = os.path.splitext(entry.name)[1].lower()
+            parents.append(folders[os.path.dirname(entry.path)])
+            sizes.append(-1 if entry.size is None else entry.size)
+            mtimes.append(float('nan') if entry.mtime is None else entry.mtime)
+            extids.append(exts.setdefault(ext, len(exts)))
+            isdirs.append(entry.is_dir)
+            names += os.fsencode(entry.name)
+            offsets.append(len(names))
+        columns = {
+            name: np.frombuffer(column, dtype=column.typecode).astype(COLUMNS[name])
+            for name, column in zip(
+                ('parent', 'size', 'mtime', 'ext', 'dir'),
+                (parents, sizes, mtimes, extids, isdirs),
+            )
+        }
+        kinds = {'': 0}
+        types = [(mimes.get(ext) or '').split('/')[0] for ext in exts]
+        lookup = [kinds.setdefault(kind, len(kinds)) for kind in types]
+        columns['kind'] = np.array(lookup, dtype=COLUMNS['kind'])[columns['ext']]
+        return cls(
+            root,
+            columns,
+            np.frombuffer(bytes(names), dtype=np.uint8),
+            np.frombuffer(offsets, dtype=np.int64),
+            np.array([*exts], dtype=str),
+            np.array([*kinds], dtype=str),
+        )
+
+    def save(self, folder: str) -> str:
+        """
+        Write the snapshot into a folder of .npy files, creating it if necessary. Returns the folder's path
+        """
+        np = _numpy()
+        folder = os.path.realpath(os.path.expanduser(str(folder)))
+        os.makedirs(folder, exist_ok=True)
+        arrays = {
+            'root': np.array([self.root], dtype=str),
+            'names': self.names,
+            'offsets': self.offsets,
+            'exts': self.exts,
+            'kinds': self.kinds,
+            **self.columns,
+        }
+        for name, data in arrays.items():
+            np.save(os.path.join(folder, name + '.npy'), data)
+        return folder
+
+    @classmethod
+    def load(cls, folder: str, mmap: bool = True) -> "Snapshot":
+        """
+        Read a snapshot written by Snapshot.save
+        Params
+            mmap
+                True -> map the large arrays into memory instead of reading them, so only the pages used are loaded
+        """
+        np = _numpy()
+        folder = os.path.realpath(os.path.expanduser(str(folder)))
+        mode = 'r' if mmap else None
+        read = lambda name, mode=None: np.load(
+            os.path.join(folder, name + '.npy'), mmap_mode=mode
+        )
+        return cls(
+            str(read('root')[0]),
+            {column: read(column, mode) for column in COLUMNS},
+            read('names', mode),
+            read('offsets', mode),
+            read('exts'),
+            read('kinds'),
+        )
+
+    def name(self, id: int) -> str:
+        """
+        The name of the path with the given id
+        """
+        start, end = self.offsets[id], self.offsets[id + 1]
+        return os.fsdecode(self.names[start:end].tobytes())
+
+    def paths(self, ids: Iterable[int]) -> list[str]:
+        """
+        The paths with the given ids
+        Directories' paths are remembered while rebuilding them, so shared ancestors are only rebuilt once
+        """
+        parents, known = self['parent'], {-1: self.root}
+
+        def path(id: int) -> str:
+            if id in known:
+                return known[id]
+            chain = []
+            while id not in known:
+                chain.append(id)
+                id = int(parents[id])
+            base = known[id]
+            for id in reversed(chain):
+                base = known[id] = os.path.join(base, self.name(id))
+            return base
+
+        return [path(int(id)) for id in ids]
+
+    def _ids(self, labels: str | Iterable[str], vocabulary) -> "numpy.ndarray":
+        """
+        The ids of the labels found in a vocabulary. Strings are split at whitespace
+        """
+        np = _numpy()
+        if isinstance(labels, str):
+            labels = labels.split()
+        return np.flatnonzero(np.isin(vocabulary, [*labels]))
+
+    def mask(
+        self,
+        min_size: int = None,
+        max_size: int = None,
+        exts: str | Iterable[str] = None,
+        kinds: str | Iterable[str] = None,
+        after: float = None,
+        before: float = None,
+        dirs: int = 0,
+    ) -> "numpy.ndarray":
+        """
+        A boolean array marking the entries which satisfy every given criterion, computed without looping in Python
+        Params
+            min_size, max_size
+                inclusive bounds, in bytes
+            exts
+                extensions sought, eg ".mp3 .flac". Lower cased, with their dots
+            kinds
+                mime types sought, eg "image video"
+            after, before
+                inclusive bounds on the date modified, in seconds since the epoch
+            dirs
+                0 -> files only, 1 -> files and directories, 2 -> directories only
+        """
+        np = _numpy()
+        mask = (
+            np.ones(len(self), dtype=bool) if dirs == 1 else self['dir'] == (dirs == 2)
+        )
+        if min_size is not None:
+            mask &= self['size'] >= min_size
+        if max_size is not None:
+            mask &= self['size'] <= max_size
+        if after is not None:
+            mask &= self['mtime'] >= after
+        if before is not None:
+            mask &= self['mtime'] <= before
+        if exts is not None:
+            mask &= np.isin(self['ext'], self._ids(exts, self.exts))
+        if kinds is not None:
+            mask &= np.isin(self['kind'], self._ids(kinds, self.kinds))
+        return mask
+
+    def select(self, **criteria) -> "numpy.ndarray":
+        """
+        The ids of the entries satisfying every given criterion. Takes the same arguments as self.mask
+        """
+        return _numpy().flatnonzero(self.mask(**criteria))
+
+    def totals(
+        self, by: str = 'ext', rows: "numpy.ndarray" = None
+    ) -> dict[str, tuple[int, int]]:
+        """
+        The number of files, and of bytes, in each group, largest first
+        Params
+            by
+                'ext' or 'kind'
+            rows
+                the entries to count, as ids from self.select or a boolean array from self.mask. Defaults to every file
+        """
+        np = _numpy()
+        if not by in ('ext', 'kind'):
+            raise ValueError(f"Cannot group by {by!r}, try 'ext' or 'kind'")
+        vocabulary = getattr(self, by + 's')
+        rows = ~self['dir'] if rows is None else rows
+        groups, sizes = self[by][rows], np.maximum(self['size'][rows], 0)
+        files = np.bincount(groups, minlength=len(vocabulary))
+        total = np.bincount(groups, weights=sizes, minlength=len(vocabulary))
+        order = np.argsort(total, kind='stable')[::-1]
+        return {
+            str(vocabulary[i]): (int(files[i]), int(total[i]))
+            for i in order
+            if files[i]
+        }
+
+    def histogram(
+        self,
+        column: str = 'mtime',
+        bins: int | Iterable = 10,
+        rows: "numpy.ndarray" = None,
+    ) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+        """
+        numpy.histogram of a column, eg for the ages or sizes of files. Returns (counts, edges)
+        Params
+            column
+                'mtime' or 'size'
+            bins
+                the number of bins, or their edges
+            rows
+                the entries to count, as ids from self.select or a boolean array from self.mask. Defaults to every file
+        """
+        np = _numpy()
+        values = self[column][~self['dir'] if rows is None else rows]
+        if column == 'mtime':
+            values = values[~np.isnan(values)]
+        return np.histogram(values, bins)
@@ -1,19 +1,445 @@
 # __all__ = "walk files folders".split()
-__all__ = "search_iter files show search folders walk".split()
+__all__ = (
+    "search_iter files show search folders walk compile_query query_cache_info"
+    " query_cache_clear WalkEntry search_many awalk afiles afolders asearch".split()
+)
 
 
-from typing import Iterator, Iterable, Any
-from itertools import permutations, chain
-import os, re
+from typing import Iterator, Iterable, Any, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from bisect import bisect_left
+from collections import Counter, deque
+from functools import cached_property, lru_cache
+from itertools import permutations, chain, islice
+from operator import attrgetter
+import asyncio, os, re
 from sl4ng import pop, show, multisplit, join, mainame, eq
 
 
+QUERY_CACHE_SIZE = 256
+
+ORDERS = 'dfs', 'bfs'
+
 LOCKOUTS = "Config.Msi*System Volume Information*$Recycle.Bin*C:\\Users\\Administrator*com.apple.HomeKit".lower().split(
     '*'
 )
 
 
-def walk(root: str = '.', dirs: bool = False, absolute: bool = True) -> Iterator[str]:
+def _glob(pattern: str) -> str:
+    """
+    Translate a .gitignore-style glob into regex
+    Unlike fnmatch, wildcards don't cross directory boundaries unless doubled ("**")
+    """
+    i, n, out = 0, len(pattern), []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif c == '*':
+            out.append('[^/]*')
+            i += 1
+        elif c == '?':
+            out.append('[^/]')
+            i += 1
+        elif c == '[' and (j := pattern.find(']', i + 2)) > 0:
+            body = pattern[i + 1 : j].replace('\\', '\\\\')
+            out.append('[' + ('^' + body[1:] if body[0] == '!' else body) + ']')
+            i = j + 1
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return ''.join(out)
+
+
+class Rules:
+    """
+    Precompiled .gitignore-style exclusion rules, anchored at a base directory
+
+    Supported syntax
+        blank lines and lines starting with '#' are skipped
+        '!' re-includes anything excluded by an earlier rule
+        a trailing '/' only matches directories
+        a rule containing any other '/' is matched against the path relative to the base,
+            otherwise it is matched against names at any depth
+        '*', '?', '[...]', and '**' are wildcards
+    Literal names are looked up in sets, and globs are merged into a single pattern for each kind of rule,
+    so the cost of a check does not grow with the number of rules unless some of them are negated
+    """
+
+    def __init__(self, lines: Iterable[str], base: str):
+        self.base = base if base.endswith(os.sep) else base + os.sep
+        rules = []
+        for line in lines:
+            line = line.rstrip('\r\n').rstrip(' ')
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            line = line[negate:]
+            dironly = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if line:
+                rules.append((negate, dironly, anchored, line))
+        self.ordered = None
+        if any(negate for negate, *_ in rules):
+            self.ordered = [
+                (negate, dironly, anchored, re.compile(_glob(rule)).fullmatch)
+                for negate, dironly, anchored, rule in rules[::-1]
+            ]
+            return
+        self.names, self.dirnames = set(), set()
+        globs = {key: [] for key in ((0, 0), (0, 1), (1, 0), (1, 1))}
+        for _, dironly, anchored, rule in rules:
+            if not (anchored or any(c in rule for c in '*?[\\')):
+                (self.names, self.dirnames)[dironly].add(rule)
+            else:
+                globs[anchored, dironly].append(_glob(rule))
+        self.globs = {
+            key: re.compile('|'.join(value)).fullmatch
+            for key, value in globs.items()
+            if value
+        }
+
+    @classmethod
+    def read(cls, path: str, base: str = None) -> "Rules":
+        """
+        Load the rules from an ignore file. They are anchored at the file's directory by default
+        """
+        try:
+            with open(path, encoding='utf-8', errors='replace') as fob:
+                lines = fob.readlines()
+        except OSError:
+            lines = []
+        return cls(lines, base or os.path.dirname(path))
+
+    def __call__(self, path: str, name: str, isdir: bool) -> bool | None:
+        """
+        True -> excluded, False -> explicitly re-included, None -> no rule applies
+        """
+        relative = path[len(self.base) :]
+        if os.sep != '/':
+            relative = relative.replace(os.sep, '/')
+        if self.ordered:
+            for negate, dironly, anchored, match in self.ordered:
+                if (isdir or not dironly) and match((name, relative)[anchored]):
+                    return not negate
+            return None
+        if name in self.names or isdir and name in self.dirnames:
+            return True
+        for (anchored, dironly), match in self.globs.items():
+            if (isdir or not dironly) and match((name, relative)[anchored]):
+                return True
+        return None
+
+
+class Pruner:
+    """
+    Decide which entries a traversal may yield, and which directories it may open
+    Excluded directories are never opened, nor are directories at the maximum depth
+
+    Params
+        root
+            the directory at which the traversal starts
+        max_depth
+            how many levels beneath root to yield. 1 -> root's immediate content only, None -> no limit
+        exclude
+            .gitignore-style rules, anchored at root, for anything which should be skipped
+        ignore
+            names of ignore files, e.g. '.gitignore', to honour in each directory along the way
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_depth: int = None,
+        exclude: str | Iterable[str] = (),
+        ignore: str | Iterable[str] = (),
+    ):
+        exclude = exclude.split() if isinstance(exclude, str) else [*exclude]
+        self.max_depth = max_depth
+        self.ignore = ignore.split() if isinstance(ignore, str) else [*ignore]
+        self.context = 0, ((Rules(exclude, root),) if exclude else ())
+
+    def __call__(
+        self, folder: str, context: tuple, listing: list[tuple[os.DirEntry, bool]]
+    ) -> Iterator[tuple[os.DirEntry, bool, tuple | None]]:
+        """
+        Filter a directory's listing, pairing each surviving directory with the context needed to open it
+        Directories which must not be opened are paired with None
+        """
+        depth, rules = context
+        depth += 1
+        if self.max_depth is not None and depth > self.max_depth:
+            return
+        if self.ignore:
+            names = {entry.name for entry, _ in listing}
+            rules = rules + tuple(
+                Rules.read(os.path.join(folder, name), folder)
+                for name in self.ignore
+                if name in names
+            )
+        inner = (
+            (depth, rules) if self.max_depth is None or depth < self.max_depth else None
+        )
+        for entry, descend in listing:
+            if rules:
+                isdir = entry.is_dir()
+                for rule in reversed(rules):
+                    verdict = rule(entry.path, entry.name, isdir)
+                    if verdict is not None:
+                        break
+                if verdict:
+                    continue
+            yield entry, descend, inner if descend else None
+
+
+class WalkEntry:
+    """
+    A path met by a walker, along with the stat data gathered as it was passed
+    Yielded by walk, files, and folders when entries=True, so that nobody needs to stat the path again.
+    Sizes, times, and inodes are those of a symlink's target. They are None if the target is missing
+    """
+
+    __slots__ = 'name', 'path', 'is_dir', 'size', 'mtime', 'inode', 'device'
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        is_dir: bool,
+        size: int = None,
+        mtime: float = None,
+        inode: int = None,
+        device: int = None,
+    ):
+        self.name, self.path, self.is_dir = name, path, is_dir
+        self.size, self.mtime, self.inode, self.device = size, mtime, inode, device
+
+    @classmethod
+    def from_entry(cls, entry: os.DirEntry) -> "WalkEntry":
+        """
+        Record a DirEntry. On Windows its stat data comes free with the listing, elsewhere it costs one stat call
+        """
+        try:
+            stat = entry.stat()
+        except OSError:
+            return cls(entry.name, entry.path, False)
+        return cls(
+            entry.name,
+            entry.path,
+            entry.is_dir(),
+            stat.st_size,
+            stat.st_mtime,
+            stat.st_ino,
+            stat.st_dev,
+        )
+
+    def __repr__(self):
+        kind = ('file', 'dir')[self.is_dir]
+        return f"WalkEntry({kind}={self.path!r}, size={self.size}, mtime={self.mtime})"
+
+    def __str__(self):
+        return self.path
+
+    def __fspath__(self):
+        return self.path
+
+
+def _locked(entry: os.DirEntry) -> bool:
+    """
+    Check if a directory is locked out
+    A symlink is locked out if either its own name or its target's is, so only symlinks cost a realpath call
+    """
+    if entry.name.lower() in LOCKOUTS:
+        return True
+    if not entry.is_symlink():
+        return False
+    return os.path.basename(os.path.realpath(entry.path)).lower() in LOCKOUTS
+
+
+def _listing(path: str) -> list[tuple[os.DirEntry, bool]]:
+    """
+    Read a single directory with os.scandir
+    Each entry is paired with whether or not a walker should descend into it.
+    Locked out directories are not descended into, and are otherwise treated like files.
+    The DirEntry type cache means that only symlinks cost an extra stat call
+    Symlinked directories are read through the link, so their content keeps the link's path rather than the target's
+    """
+    with os.scandir(path) as it:
+        return [(e, e.is_dir() and not _locked(e)) for e in it]
+
+
+def _scan(
+    root: str,
+    workers: int = None,
+    ordered: bool = False,
+    pruner: Pruner = None,
+    order: str = 'dfs',
+) -> Iterator[tuple[os.DirEntry, bool]]:
+    """
+    Traverse a directory's tree, yielding (entry, descend) pairs
+    This is the engine shared by walk, files, and folders
+    Directory reads are fanned out over a thread pool if more than one worker is requested
+    Traversals keep their own stack or queue, so the cost of each entry does not depend on its depth,
+    and trees of any depth can be walked without reaching the recursion limit
+    """
+    if not order in ORDERS:
+        raise ValueError(f"order must be one of {ORDERS}, not {order!r}")
+    pruner = pruner or Pruner(root)
+    if workers and workers > 1:
+        yield from _pscan(root, workers, ordered, pruner, order)
+    elif order == 'bfs':
+        yield from _breadth(root, pruner)
+    else:
+        yield from _depth(root, pruner)
+
+
+def _depth(root: str, pruner: Pruner) -> Iterator[tuple[os.DirEntry, bool]]:
+    """
+    Serial, depth-first half of _scan. Entries come out in pre-order
+    The stack holds one pruned listing per open directory.
+    Entering a directory pushes its listing, and an exhausted listing is popped to resume its parent's
+    """
+    stack = [pruner(root, pruner.context, _listing(root))]
+    while stack:
+        for entry, descend, inner in stack[-1]:
+            yield entry, descend
+            if inner:
+                stack.append(pruner(entry.path, inner, _listing(entry.path)))
+                break
+        else:
+            stack.pop()
+
+
+def _breadth(
+    root: str, pruner: Pruner, pool: ThreadPoolExecutor = None, limit: int = 0
+) -> Iterator[tuple[os.DirEntry, bool]]:
+    """
+    Breadth-first half of _scan. Entries come out level by level
+    Given a pool, the next few directories in the queue are read ahead of time,
+    without changing the order in which anything is yielded
+    """
+    queue = deque([[root, pruner.context, None]])
+    while queue:
+        folder, context, future = queue.popleft()
+        if pool:
+            for item in islice(queue, limit):
+                if item[2] is None:
+                    item[2] = pool.submit(_listing, item[0])
+        listing = future.result() if future else _listing(folder)
+        for entry, descend, inner in pruner(folder, context, listing):
+            yield entry, descend
+            if inner:
+                queue.append([entry.path, inner, None])
+
+
+def _pscan(
+    root: str, workers: int, ordered: bool, pruner: Pruner, order: str = 'dfs'
+) -> Iterator[tuple[os.DirEntry, bool]]:
+    """
+    Traverse a directory's tree while reading directories on a bounded thread pool
+    No more than 2*workers listings are ever in flight or waiting to be consumed,
+    so memory stays bounded no matter how wide the tree is.
+    Pending directories are kept on a stack for depth-first traversals, so that the frontier grows with depth rather than width,
+    and on a queue for breadth-first ones.
+
+    Params
+        ordered
+            True -> yield in exactly the same order as the serial traversal
+            False -> yield listings as soon as they are read
+    """
+    limit = 2 * workers
+    pool = ThreadPoolExecutor(workers, thread_name_prefix='filey-walk')
+    try:
+        if ordered:
+            if order == 'bfs':
+                yield from _breadth(root, pruner, pool, limit)
+            else:
+                yield from _ordered_pscan(pool, root, limit, pruner)
+            return
+        pending = deque([(root, pruner.context)])
+        take = (pending.pop, pending.popleft)[order == 'bfs']
+        running = {}
+        while pending or running:
+            while pending and len(running) < limit:
+                folder, context = take()
+                running[pool.submit(_listing, folder)] = folder, context
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder, context = running.pop(future)
+                for entry, descend, inner in pruner(folder, context, future.result()):
+                    yield entry, descend
+                    if inner:
+                        pending.append((entry.path, inner))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ordered_pscan(
+    pool: ThreadPoolExecutor, root: str, limit: int, pruner: Pruner
+) -> Iterator[tuple[os.DirEntry, bool]]:
+    """
+    Deterministic half of _pscan
+    Each frame on the stack holds [listing, position, prefetch cursor].
+    Whenever a directory is entered, the directories which will be needed soonest are submitted to the pool,
+    closest frames first, until the number of prefetched listings reaches the limit.
+    """
+    futures = {}
+
+    def fetch(path: str, context: tuple) -> list[tuple[os.DirEntry, bool, tuple]]:
+        future = futures.pop(path, None)
+        listing = future.result() if future else _listing(path)
+        return [*pruner(path, context, listing)]
+
+    def prefetch():
+        for frame in reversed(stack):
+            listing, cursor = frame[0], frame[2]
+            while cursor < len(listing) and len(futures) < limit:
+                entry, descend, inner = listing[cursor]
+                if inner:
+                    futures[entry.path] = pool.submit(_listing, entry.path)
+                cursor += 1
+            frame[2] = cursor
+            if len(futures) >= limit:
+                break
+
+    stack = [[fetch(root, pruner.context), 0, 0]]
+    prefetch()
+    while stack:
+        frame = stack[-1]
+        listing, position = frame[0], frame[1]
+        if position == len(listing):
+            stack.pop()
+            continue
+        frame[1] += 1
+        entry, descend, inner = listing[position]
+        yield entry, descend
+        if inner:
+            frame[2] = max(frame[2], frame[1])
+            stack.append([fetch(entry.path, inner), 0, 0])
+            prefetch()
+
+
+def walk(
+    root: str = '.',
+    dirs: bool = False,
+    absolute: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+    entries: bool = False,
+) -> Iterator[str | WalkEntry]:
     """
     Walk a directory's tree yielding paths to any files and/or folders along the way
     This will always yield files.
@@ -24,6 +450,9 @@ def walk(root: str = '.', dirs: bool = False, absolute: bool = True) -> Iterator
     changes the current directory, and assumes that the client doesn't
     either. - taken from os.walk documentation
 
+    The content of a symlinked directory is yielded beneath the link's path, not the target's,
+    and a link to a locked out directory is treated like the directory itself
+
     Params
         root: str|pathlike|Place
             path to starting directory
@@ -31,36 +460,99 @@ def walk(root: str = '.', dirs: bool = False, absolute: bool = True) -> Iterator
             (True -> omit, False -> include) paths to directories
         absolute
             yield (True -> absolute paths, False -> names only)
+        workers
+            number of threads reading directories concurrently. None or 1 -> serial
+        ordered
+            Ignored unless workers > 1. True -> same order as the serial walk, False -> first come first served
+        order
+            'dfs' -> depth-first, each directory's content follows it. 'bfs' -> breadth-first, level by level
+        max_depth
+            how many levels beneath root to yield. 1 -> root's immediate content only, None -> no limit
+        exclude
+            .gitignore-style rules for anything which should be skipped, anchored at root
+            eg: "node_modules .git *.pyc build/"
+        ignore
+            names of ignore files, eg ".gitignore", whose rules are honoured in the directories containing them
+        entries
+            True -> yield WalkEntry records, carrying the stat data gathered along the way, instead of strings
     """
     root = (str, os.path.realpath)[absolute](str(root))
-    for name in os.listdir(root):
-        path = os.path.join(root, name)
-        if os.path.isdir(path) and not name.lower() in LOCKOUTS:
-            if dirs:
-                yield (name, path)[absolute]
-            yield from walk(path, dirs=dirs, absolute=absolute)
-        else:
-            yield (name, path)[absolute]
+    emit = WalkEntry.from_entry if entries else attrgetter(('name', 'path')[absolute])
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    for entry, descend in _scan(root, workers, ordered, pruner, order):
+        if dirs or not descend:
+            yield emit(entry)
+
+
+PATTERN_CHARS = set('\\^$+?{}[]|()')
+
 
+class Suffixes:
+    """
+    Check names against a casefolded set of plain extensions
+    This is what parse_extensions gives you unless the extensions contain regex syntax.
+    Multi-part extensions like "tar.gz" are supported, and an empty set matches everything
+    """
+
+    def __init__(self, extensions: Iterable[str]):
+        self.suffixes = tuple(
+            {'.' + e.strip().lstrip('.').casefold() for e in extensions}
+        )
+        self.longest = max(map(len, self.suffixes), default=0)
+
+    def __repr__(self):
+        return f"Suffixes({' '.join(sorted(self.suffixes))})"
 
-def parse_extensions(extensions: str) -> re.Pattern:
+    def search(self, string: str) -> bool:
+        """
+        Check if a name or path ends with one of the suffixes
+        """
+        if not self.suffixes:
+            return True
+        return string[-self.longest :].casefold().endswith(self.suffixes)
+
+
+def split_extensions(extensions: str) -> list[str]:
     """
-    Create a regex parser to check for file extensions.
+    Split a string of extensions separated by one of
+        [',', '`', '*', ' ']
+    """
+    sep = [i for i in ',`* ' if i in extensions]
+    return extensions.split(sep[0] if sep else None)
+
+
+def parse_extensions(extensions: str) -> Suffixes | re.Pattern:
+    """
+    Create a parser to check for file extensions.
+    Plain extensions are checked against a set of suffixes, only real patterns are compiled as regex
         Note: Separate extensions by one of
             [',', '`', '*', ' ']
     """
-    sep = [i for i in ',`* ' if i in extensions]
-    pattern = '|'.join(f'\.{i}$' for i in extensions.split(sep[0] if sep else None))
+    parts = split_extensions(extensions)
+    if not any(PATTERN_CHARS.intersection(part) for part in parts):
+        return Suffixes(parts)
+    pattern = '|'.join(f'\.{i}$' for i in parts)
     pat = re.compile(pattern, re.I)
     return pat
 
 
 def files(
-    root: str = '.', exts: str = '', negative: bool = False, absolute: bool = True
-) -> Iterator[str]:
+    root: str = '.',
+    exts: str = '',
+    negative: bool = False,
+    absolute: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+    entries: bool = False,
+) -> Iterator[str | WalkEntry]:
     """
     Search for files along a directory's tree.
     Also (in/ex)-clude any whose extension satisfies the requirement
+    Symlinked directories are walked as in walk: their content keeps the link's path
 
     Params
         root: str|pathlike|Place
@@ -73,24 +565,49 @@ def files(
             (True -> omit, False -> include) matching extensions
         absolute
             yield (True -> abspaths, False -> names only)
+        workers
+            number of threads reading directories concurrently. None or 1 -> serial
+        ordered
+            Ignored unless workers > 1. True -> same order as the serial walk, False -> first come first served
+        order
+            'dfs' -> depth-first, each directory's content follows it. 'bfs' -> breadth-first, level by level
+        max_depth
+            how many levels beneath root to yield. 1 -> root's immediate content only, None -> no limit
+        exclude
+            .gitignore-style rules for anything which should be skipped, anchored at root
+            eg: "node_modules .git *.pyc build/"
+        ignore
+            names of ignore files, eg ".gitignore", whose rules are honoured in the directories containing them
+        entries
+            True -> yield WalkEntry records, carrying the stat data gathered along the way, instead of strings
     """
     root = (str, os.path.realpath)[absolute](str(root))
-    pat = parse_extensions(exts)
-    predicate = lambda x: not bool(pat.search(x)) if negative else bool(pat.search(x))
+    pat = compile_query(exts=exts).exts
+    emit = WalkEntry.from_entry if entries else attrgetter(('name', 'path')[absolute])
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    field = ('path', 'name')[isinstance(pat, Suffixes)]
     name = os.path.split(root)[1]
     if not (name.lower() in LOCKOUTS or root.lower() in LOCKOUTS):
-        for name in os.listdir(root):
-            path = os.path.join(root, name)
-            if os.path.isdir(path) and not name.lower() in LOCKOUTS:
-                yield from files(path, exts=exts, negative=negative, absolute=absolute)
-            elif predicate(path):
-                yield (name, path)[absolute]
+        for entry, descend in _scan(root, workers, ordered, pruner, order):
+            if not descend and bool(pat.search(getattr(entry, field))) != negative:
+                yield emit(entry)
 
 
-def folders(root: str = '.', absolute: bool = True) -> Iterator[str]:
+def folders(
+    root: str = '.',
+    absolute: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+    entries: bool = False,
+) -> Iterator[str | WalkEntry]:
     """
     Search for files along a directory's tree.
     Also (in/ex)-clude any whose extension satisfies the requirement
+    Symlinked directories are walked as in walk: their content keeps the link's path
 
     Params
         root: str|pathlike|Place
@@ -103,16 +620,31 @@ def folders(root: str = '.', absolute: bool = True) -> Iterator[str]:
             (True -> omit, False -> include) matching extensions
         absolute
             yield (True -> abspaths, False -> names only)
+        workers
+            number of threads reading directories concurrently. None or 1 -> serial
+        ordered
+            Ignored unless workers > 1. True -> same order as the serial walk, False -> first come first served
+        order
+            'dfs' -> depth-first, each directory's content follows it. 'bfs' -> breadth-first, level by level
+        max_depth
+            how many levels beneath root to yield. 1 -> root's immediate content only, None -> no limit
+        exclude
+            .gitignore-style rules for anything which should be skipped, anchored at root
+            eg: "node_modules .git *.pyc build/"
+        ignore
+            names of ignore files, eg ".gitignore", whose rules are honoured in the directories containing them
+        entries
+            True -> yield WalkEntry records, carrying the stat data gathered along the way, instead of strings
     """
     root = (str, os.path.realpath)[absolute](str(root))
-    for name in os.listdir(root):
-        path = os.path.join(root, name)
-        if os.path.isdir(path) and not name.lower() in LOCKOUTS:
-            yield (name, path)[absolute]
-            yield from folders(path, absolute=absolute)
+    emit = WalkEntry.from_entry if entries else attrgetter(('name', 'path')[absolute])
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    for entry, descend in _scan(root, workers, ordered, pruner, order):
+        if descend:
+            yield emit(entry)
 
 
-def __term_perms(terms: str, case: int, tight: bool) -> re.Pattern:
+def _term_perms(terms: str, case: int, tight: bool) -> re.Pattern:
     """
     compute the regex pattern for posible permutations of search terms
     """
@@ -124,6 +656,399 @@ def __term_perms(terms: str, case: int, tight: bool) -> re.Pattern:
     return re.compile("|".join(rack), case)
 
 
+SEPARATORS = re.compile("[\\ _\\-]*")
+
+
+class TermMatcher:
+    """
+    Match all of the given terms in any order, at a cost which grows linearly with the number of terms
+    This gives the same answers as searching with _term_perms, without compiling n! alternatives
+
+        loose (tight=False)
+            every term needs its own occurrence on a single line, and none of those occurrences may overlap
+        tight (tight=True)
+            the occurrences must form a chain in which each term is followed by the next,
+            separated by nothing but [' ', '_', '-']
+
+    Each term is found with a single scan of the string.
+    Terms whose occurrences collide with no other term's are settled by counting;
+    only the colliding ones are fitted together, left to right, by a small dynamic programme.
+    """
+
+    def __init__(self, terms: str | Iterable[str], case: int, tight: bool):
+        words = terms.split() if isinstance(terms, str) else list(terms)
+        self.terms, self.case, self.tight = words, case, tight
+        fold = lambda w: w.lower() if case and w.isascii() else w
+        counts = Counter(map(fold, words))
+        self.needs = tuple(counts.values())
+        self.patterns = [re.compile(f"(?=({re.escape(w)}))", case) for w in counts]
+        self.presence = [re.compile(re.escape(w), case).search for w in counts]
+        self.linear = bool(words) and all(w and not '\n' in w for w in words)
+        self.__fallback = None
+
+    @property
+    def fallback(self) -> re.Pattern:
+        """
+        The permutation regex, for the odd term set that the linear matcher can't express
+        """
+        if self.__fallback is None:
+            self.__fallback = _term_perms(self.terms, self.case, self.tight)
+        return self.__fallback
+
+    def search(self, string: str) -> bool:
+        if not self.linear:
+            return bool(self.fallback.search(string))
+        if not all(present(string) for present in self.presence):
+            return False
+        if self.needs == (1,):
+            return True
+        if self.tight:
+            return self.__chain(string)
+        return any(map(self.__loose, string.split('\n')))
+
+    def __occurrences(self, string: str) -> list[list[tuple[int, int]]]:
+        """
+        (start, end) of every occurrence, overlapping or not, of each term
+        """
+        return [
+            [(m.start(), m.end(1)) for m in pattern.finditer(string)]
+            for pattern in self.patterns
+        ]
+
+    def __loose(self, line: str) -> bool:
+        """
+        Check if a single line holds a non-overlapping occurrence for every term
+        """
+        occurrences = self.__occurrences(line)
+        if any(len(o) < n for o, n in zip(occurrences, self.needs)):
+            return False
+        ends = [-1] * len(occurrences)
+        colliding = set()
+        for start, end, i in sorted(
+            (s, e, i) for i, o in enumerate(occurrences) for s, e in o
+        ):
+            for j, last in enumerate(ends):
+                if j != i and last > start:
+                    colliding.update((i, j))
+            ends[i] = max(ends[i], end)
+        for i, occurrence in enumerate(occurrences):
+            if not i in colliding:
+                found, end = 0, 0
+                for s, e in occurrence:
+                    if s >= end:
+                        found, end = found + 1, e
+                if found < self.needs[i]:
+                    return False
+        if not colliding:
+            return True
+        rest = sorted(colliding)
+        starts = sorted(
+            (s, e, k) for k, i in enumerate(rest) for s, e in occurrences[i]
+        )
+        positions = [s for s, _, _ in starts]
+        states = {0: {tuple(self.needs[i] for i in rest)}}
+        for index in range(len(starts)):
+            start, end, k = starts[index]
+            following = bisect_left(positions, end, index + 1)
+            for remaining in states.pop(index, ()):
+                states.setdefault(index + 1, set()).add(remaining)
+                if remaining[k]:
+                    taken = remaining[:k] + (remaining[k] - 1,) + remaining[k + 1 :]
+                    if not any(taken):
+                        return True
+                    states.setdefault(following, set()).add(taken)
+        return False
+
+    def __chain(self, string: str) -> bool:
+        """
+        Look for a chain of adjacent occurrences which uses every term
+        """
+        starts = {}
+        for k, occurrence in enumerate(self.__occurrences(string)):
+            for s, e in occurrence:
+                starts.setdefault(s, []).append((e, k))
+        stack = [(s, self.needs) for s in starts]
+        seen = set(stack)
+        while stack:
+            position, remaining = stack.pop()
+            for end, k in starts[position]:
+                if remaining[k]:
+                    taken = remaining[:k] + (remaining[k] - 1,) + remaining[k + 1 :]
+                    if not any(taken):
+                        return True
+                    gap = SEPARATORS.match(string, end).end()
+                    for following in range(end, gap + 1):
+                        state = following, taken
+                        if following in starts and not state in seen:
+                            seen.add(state)
+                            stack.append(state)
+        return False
+
+
+class KeywordMatch:
+    """
+    A keyword found by an AhoCorasick automaton. Quacks like the parts of re.Match that the scanners use
+    """
+
+    __slots__ = 'keyword', 'string', 'begin', 'stop'
+
+    def __init__(self, keyword: str, string: str, begin: int, stop: int):
+        self.keyword, self.string, self.begin, self.stop = keyword, string, begin, stop
+
+    def __repr__(self):
+        return f"KeywordMatch(keyword={self.keyword!r}, span={self.span()})"
+
+    def start(self) -> int:
+        return self.begin
+
+    def end(self) -> int:
+        return self.stop
+
+    def span(self) -> tuple[int, int]:
+        return self.begin, self.stop
+
+    def group(self) -> str:
+        return self.string[self.begin : self.stop]
+
+
+class AhoCorasick:
+    """
+    Find any of many literal keywords in a single linear pass, however many keywords there are
+    A regex alternation of hundreds of keywords tries each of them at every position, this tries none of them.
+
+    The keywords are laid out in a trie whose failure links say where to resume after a mismatch.
+    Characters which appear in no keyword send the automaton straight back to the root.
+    finditer reports leftmost-longest, non-overlapping matches, while hits reports every keyword present
+    """
+
+    def __init__(self, keywords: Iterable[str], case: bool = False):
+        """
+        params:
+            keywords
+                the literal strings to look for
+            case
+                True -> case sensitive
+        """
+        self.case = case
+        self.keywords = [*dict.fromkeys(filter(None, keywords))]
+        self.lengths = [len(self.fold(k)) for k in self.keywords]
+        self.longest = max(self.lengths, default=0)
+        goto, out, depth = [{}], [()], [0]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in self.fold(keyword):
+                if not char in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({})
+                    out.append(())
+                    depth.append(depth[state] + 1)
+                state = goto[state][char]
+            out[state] += (index,)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] += out[fail[state]]
+            for char, child in goto[state].items():
+                link = fail[state]
+                while link and not char in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+                queue.append(child)
+        self.goto, self.fail, self.out, self.depth = goto, fail, out, depth
+        self.alphabet = frozenset(chain.from_iterable(goto))
+
+    def __repr__(self):
+        return f"AhoCorasick(keywords={len(self.keywords)}, states={len(self.goto)}, case={self.case})"
+
+    def fold(self, string: str) -> str:
+        """
+        Fold a string's case, unless the automaton is case sensitive, without changing its length
+        """
+        if self.case:
+            return string
+        lower = string.lower()
+        if len(lower) == len(string):
+            return lower
+        return ''.join(c if len(c.lower()) != 1 else c.lower() for c in string)
+
+    def __step(self, state: int, char: str) -> int:
+        """
+        The state reached from another on reading a character
+        """
+        if not char in self.alphabet:
+            return 0
+        goto, fail = self.goto, self.fail
+        while state and not char in goto[state]:
+            state = fail[state]
+        return goto[state].get(char, 0)
+
+    def __ends(self, text: str, pos: int) -> Iterator[tuple[int, int]]:
+        """
+        Run the automaton over a text from a position, yielding (end, state) wherever a keyword ends
+        """
+        goto, fail, out, alphabet = self.goto, self.fail, self.out, self.alphabet
+        state = 0
+        for end in range(pos + 1, len(text) + 1):
+            char = text[end - 1]
+            if not char in alphabet:
+                state = 0
+                continue
+            while state and not char in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                yield end, state
+
+    def __settle(self, text: str, pos: int) -> tuple[int, int, int]:
+        """
+        The (start, end, keyword index) of the leftmost-longest match from a position known to precede one
+        Reading stops once no match in progress could start as early as the best found
+        """
+        out, depth, lengths = self.out, self.depth, self.lengths
+        state, best = 0, None
+        for end in range(pos + 1, len(text) + 1):
+            state = self.__step(state, text[end - 1])
+            for index in out[state]:
+                begin = end - lengths[index]
+                if not best or begin <= best[0]:
+                    best = begin, end, index
+            if best and end - depth[state] > best[0]:
+                break
+        return best
+
+    def finditer(self, string: str, pos: int = 0) -> Iterator[KeywordMatch]:
+        """
+        Yield the leftmost-longest, non-overlapping keyword matches in a string
+        The automaton runs freely until a keyword ends, and only then settles which match that was
+        """
+        text = self.fold(string)
+        while pos < len(text):
+            first = next(self.__ends(text, pos), None)
+            if first is None:
+                return
+            begin, pos, index = self.__settle(text, max(pos, first[0] - self.longest))
+            yield KeywordMatch(self.keywords[index], string, begin, pos)
+
+    def search(self, string: str, pos: int = 0) -> KeywordMatch | None:
+        """
+        The first match in a string, if there is one
+        """
+        return next(self.finditer(string, pos), None)
+
+    def hits(self, string: str) -> set[str]:
+        """
+        Every keyword which occurs in a string, overlapping or not
+        """
+        found, out = set(), self.out
+        for end, state in self.__ends(self.fold(string), 0):
+            found.update(out[state])
+            if len(found) == len(self.keywords):
+                break
+        return {self.keywords[index] for index in found}
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_keywords(keywords: tuple[str], case: bool = False) -> AhoCorasick:
+    """
+    Build an AhoCorasick automaton, or fetch it from the cache
+    """
+    return AhoCorasick(keywords, case)
+
+
+class Query:
+    """
+    A compiled search, as used by search_iter
+    Only the pattern needed for the given strictness is ever compiled, and only once it is first used.
+    Instances are shared through compile_query's cache, so build them with that rather than directly
+    """
+
+    def __init__(
+        self, terms: str | tuple[str], exts: str, case: bool, strict: int, regex: bool
+    ):
+        self.source, self.extensions = terms, exts
+        self.case, self.strict, self.regex = case, strict, regex
+
+    def __repr__(self):
+        return (
+            f"Query(terms={self.source!r}, exts={self.extensions!r},"
+            f" case={self.case}, strict={self.strict}, regex={self.regex})"
+        )
+
+    @cached_property
+    def terms(self) -> re.Pattern | TermMatcher:
+        """
+        The compiled terms pattern
+        """
+        terms, strict = self.source, self.strict
+        flags = 0 if self.case else re.I
+        if self.regex or strict == 5:
+            return re.compile(terms, flags)
+        if strict == 0:
+            words = terms.split() if isinstance(terms, str) else terms
+            return re.compile("|".join(map(re.escape, words)), flags)
+        if strict in (1, 2):
+            return TermMatcher(terms, flags, strict == 2)
+        sep = "[\\ _\\-]*" if strict == 4 else "(.)*"
+        return re.compile(sep.join(map(re.escape, terms)), flags)
+
+    @cached_property
+    def exts(self) -> Suffixes | re.Pattern:
+        """
+        The parsed extensions, a suffix set where plain suffixes are asked for and a compiled pattern otherwise
+        """
+        return parse_extensions(self.extensions)
+
+    def __call__(self, string: str, negative: bool = False) -> bool:
+        """
+        Check if a string satisfies the query
+            negative
+                True -> neither the terms nor the extensions may match
+        """
+        if negative:
+            return not (self.terms.search(string) or self.exts.search(string))
+        return bool(self.terms.search(string) and self.exts.search(string))
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _compile_query(
+    terms: str | tuple[str], exts: str, case: bool, strict: int, regex: bool
+) -> Query:
+    return Query(terms, exts, case, strict, regex)
+
+
+def compile_query(
+    terms: str | Iterable[str] = '',
+    exts: str = '',
+    case: bool = False,
+    strict: int = 1,
+    regex: bool = False,
+) -> Query:
+    """
+    Fetch a compiled Query from the shared, bounded, least-recently-used cache
+    Searches, walkers, Libraries, and Scanners all compile their patterns through here,
+    so a service issuing the same small searches over and over only compiles each one once.
+    Params are as for search_iter
+    """
+    if not isinstance(terms, str):
+        terms = tuple(terms)
+    return _compile_query(terms, exts, bool(case), strict, bool(regex))
+
+
+def query_cache_info() -> tuple[int, int, int, int]:
+    """
+    Hits, misses, maxsize, and currsize of compile_query's cache
+    """
+    return _compile_query.cache_info()
+
+
+def query_cache_clear() -> None:
+    """
+    Empty compile_query's cache and reset its counters
+    """
+    _compile_query.cache_clear()
+
+
 def search_iter(
     iterable: str,
     terms: Iterable[str],
@@ -167,32 +1092,10 @@ def search_iter(
             True -> only yield results whose names match
             False -> yield results who match at any level
     """
-    tight = strict in (2, 4)
-    sep = "[\\ _\\-]*" if tight else "(.)*"
     scope = (str, lambda x: os.path.split(x)[1])[names]
-    case = 0 if case else re.I
-
-    expat = parse_extensions(exts)
-    tepat = (
-        {
-            0: re.compile("|".join(map(re.escape, terms.split())), case),
-            1: __term_perms(terms, case, 0),
-            2: __term_perms(terms, case, 1),
-            3: re.compile(sep.join(map(re.escape, terms)), case),
-            4: re.compile(sep.join(map(re.escape, terms)), case),
-            5: re.compile(terms, case),
-        }[strict]
-        if not regex
-        else re.compile(terms, case)
-    )
-
-    predicate = (
-        lambda i: tepat.search(i) and expat.search(i),
-        lambda i: not (tepat.search(i) or expat.search(i)),
-    )[negative]
-
+    query = compile_query(terms, exts, case, strict, regex)
     for i in iterable:
-        if predicate(scope(i)):
+        if query(scope(i), negative):
             yield i
 
 
@@ -206,6 +1109,12 @@ def search(
     strict: int = 1,
     regex: bool = False,
     names: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
 ) -> Iterator[str]:
     """
     Find files matching the given terms within a directory's tree
@@ -239,6 +1148,19 @@ def search(
         names
             True -> only yield results whose names match
             False -> yield results who match at any level
+        workers
+            number of threads reading directories concurrently. None or 1 -> serial
+        ordered
+            Ignored unless workers > 1. True -> same order as the serial walk, False -> first come first served
+        order
+            'dfs' -> depth-first, each directory's content follows it. 'bfs' -> breadth-first, level by level
+        max_depth
+            how many levels beneath root to yield. 1 -> root's immediate content only, None -> no limit
+        exclude
+            .gitignore-style rules for anything which should be skipped, anchored at root
+            eg: "node_modules .git *.pyc build/"
+        ignore
+            names of ignore files, eg ".gitignore", whose rules are honoured in the directories containing them
     """
     func = {0: files, 1: walk, 2: folders}[dirs]
     kwargs = {
@@ -246,6 +1168,14 @@ def search(
         1: {"dirs": True, "absolute": True},
         2: {"absolute": True},
     }[dirs]
+    kwargs.update(
+        workers=workers,
+        ordered=ordered,
+        order=order,
+        max_depth=max_depth,
+        exclude=exclude,
+        ignore=ignore,
+    )
 
     yield from search_iter(
         (i for i in func(root, **kwargs)),
@@ -255,10 +1185,311 @@ def search(
         negative=negative,
         dirs=dirs,
         strict=strict,
+        regex=regex,
         names=names,
     )
 
 
+def _batch(queries: Iterable[str | dict] | dict[Any, str | dict]) -> list[tuple]:
+    """
+    Compile a batch of searches into (tag, dirs, negative, names, query) tuples
+    Each search is either a terms string or a dict of search's keyword arguments.
+    Searches are tagged with their keys if given as a dict, and with themselves otherwise
+    """
+
+    def spec(
+        terms: str,
+        exts: str = '',
+        case: bool = False,
+        negative: bool = False,
+        dirs: int = 0,
+        strict: int = 1,
+        regex: bool = False,
+        names: bool = True,
+    ) -> tuple[int, bool, bool, Query]:
+        return dirs, negative, names, compile_query(terms, exts, case, strict, regex)
+
+    items = queries.items() if isinstance(queries, dict) else ((q, q) for q in queries)
+    return [
+        (tag, *(spec(**query) if isinstance(query, dict) else spec(query)))
+        for tag, query in items
+    ]
+
+
+def _matches(specs: list[tuple], name: str, path: str, isdir: bool) -> Iterator[Any]:
+    """
+    The tags of every compiled search which would yield the given path
+    """
+    for tag, dirs, negative, names, query in specs:
+        if dirs == 0:
+            if isdir:
+                continue
+            pat = query.exts
+            field = name if isinstance(pat, Suffixes) else path
+            if bool(pat.search(field)) == negative:
+                continue
+        elif dirs == 2 and not isdir:
+            continue
+        if query(name if names else path, negative):
+            yield tag
+
+
+def search_many(
+    root: str,
+    queries: Iterable[str | dict] | dict[Any, str | dict],
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+) -> Iterator[tuple[Any, str]]:
+    """
+    Run many searches over a directory's tree while only walking it once
+    Yields (tag, path) pairs. Each search finds exactly what search would have found with the same arguments,
+    in the same order, but every entry is checked against all of the searches as it is passed
+
+    Params
+        root
+            the directory in which the walking search commences
+        queries
+            the searches. Each one is either a terms string or a dict of search's keyword arguments, eg:
+                ['alix perez', {'terms': 'spectrasoul', 'exts': 'mp3 flac', 'strict': 2}]
+            A dict of searches tags results with their keys instead of the searches themselves, eg:
+                {'dnb': 'alix perez', 'docs': {'terms': '', 'exts': 'pdf'}}
+        workers, ordered, order, max_depth, exclude, ignore
+            shared by every search, and have the same meanings as in search
+
+    example
+        >>> for tag, path in search_many('~/music', {'ap': 'alix perez', 'ss': 'spectrasoul'}):
+        ...     print(tag, path)
+    """
+    root = os.path.realpath(str(root))
+    specs = _batch(queries)
+    name = os.path.split(root)[1]
+    if name.lower() in LOCKOUTS or root.lower() in LOCKOUTS:
+        specs = [spec for spec in specs if spec[1]]
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    for entry, descend in _scan(root, workers, ordered, pruner, order):
+        for tag in _matches(specs, entry.name, entry.path, descend):
+            yield tag, entry.path
+
+
+async def _ascan(
+    root: str,
+    workers: int = None,
+    ordered: bool = False,
+    pruner: Pruner = None,
+    order: str = 'dfs',
+) -> AsyncIterator[tuple[os.DirEntry, bool]]:
+    """
+    Asynchronous counterpart of _scan
+    Directories are read and pruned on a thread pool, so the event loop is never blocked by the file system.
+    No more than 2*workers listings are ever in flight or waiting to be consumed,
+    and nothing more is read until the consumer asks for it, so a slow consumer holds the traversal back.
+    Cancelling the consumer, or closing the generator, cancels any pending reads
+
+    Params
+        ordered
+            True -> yield in exactly the same order as the serial traversal
+            False -> yield listings as soon as they are read. Ignored unless workers > 1
+    """
+    if not order in ORDERS:
+        raise ValueError(f"order must be one of {ORDERS}, not {order!r}")
+    pruner = pruner or Pruner(root)
+    workers = max(workers or 1, 1)
+    limit = 2 * workers
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(workers, thread_name_prefix='filey-awalk')
+    running = {}
+    futures = {}
+
+    def read(folder: str, context: tuple) -> list[tuple[os.DirEntry, bool, tuple]]:
+        return [*pruner(folder, context, _listing(folder))]
+
+    def submit(folder: str, context: tuple) -> asyncio.Future:
+        return loop.run_in_executor(pool, read, folder, context)
+
+    async def fetch(folder: str, context: tuple) -> list:
+        return await (futures.pop(folder, None) or submit(folder, context))
+
+    def prefetch():
+        for frame in reversed(stack):
+            listing, cursor = frame[0], frame[2]
+            while cursor < len(listing) and len(futures) < limit:
+                entry, descend, inner = listing[cursor]
+                if inner:
+                    futures[entry.path] = submit(entry.path, inner)
+                cursor += 1
+            frame[2] = cursor
+            if len(futures) >= limit:
+                break
+
+    try:
+        if workers > 1 and not ordered:
+            pending = deque([(root, pruner.context)])
+            take = (pending.pop, pending.popleft)[order == 'bfs']
+            while pending or running:
+                while pending and len(running) < limit:
+                    running[submit(*take())] = None
+                done, _ = await asyncio.wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    for entry, descend, inner in future.result():
+                        yield entry, descend
+                        if inner:
+                            pending.append((entry.path, inner))
+        elif order == 'bfs':
+            queue = deque([(root, pruner.context)])
+            while queue:
+                folder, context = queue.popleft()
+                for path, inner in islice(queue, limit):
+                    if len(futures) < limit and not path in futures:
+                        futures[path] = submit(path, inner)
+                for entry, descend, inner in await fetch(folder, context):
+                    yield entry, descend
+                    if inner:
+                        queue.append((entry.path, inner))
+        else:
+            stack = [[await fetch(root, pruner.context), 0, 0]]
+            prefetch()
+            while stack:
+                frame = stack[-1]
+                listing, position = frame[0], frame[1]
+                if position == len(listing):
+                    stack.pop()
+                    continue
+                frame[1] += 1
+                entry, descend, inner = listing[position]
+                yield entry, descend
+                if inner:
+                    frame[2] = max(frame[2], frame[1])
+                    stack.append([await fetch(entry.path, inner), 0, 0])
+                    prefetch()
+    finally:
+        for future in chain(running, futures.values()):
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def awalk(
+    root: str = '.',
+    dirs: bool = False,
+    absolute: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+) -> AsyncIterator[str]:
+    """
+    Asynchronous version of walk, for use with "async for"
+    Takes the same arguments as walk, but directories are always read off of the event loop
+        workers
+            number of threads reading directories concurrently. None or 1 -> one thread
+    """
+    root = (str, os.path.realpath)[absolute](str(root))
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    async for entry, descend in _ascan(root, workers, ordered, pruner, order):
+        if dirs or not descend:
+            yield (entry.name, entry.path)[absolute]
+
+
+async def afiles(
+    root: str = '.',
+    exts: str = '',
+    negative: bool = False,
+    absolute: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+) -> AsyncIterator[str]:
+    """
+    Asynchronous version of files, for use with "async for"
+    Takes the same arguments as files, but directories are always read off of the event loop
+    """
+    root = (str, os.path.realpath)[absolute](str(root))
+    pat = compile_query(exts=exts).exts
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    field = ('path', 'name')[isinstance(pat, Suffixes)]
+    name = os.path.split(root)[1]
+    if not (name.lower() in LOCKOUTS or root.lower() in LOCKOUTS):
+        async for entry, descend in _ascan(root, workers, ordered, pruner, order):
+            if not descend and bool(pat.search(getattr(entry, field))) != negative:
+                yield (entry.name, entry.path)[absolute]
+
+
+async def afolders(
+    root: str = '.',
+    absolute: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+) -> AsyncIterator[str]:
+    """
+    Asynchronous version of folders, for use with "async for"
+    Takes the same arguments as folders, but directories are always read off of the event loop
+    """
+    root = (str, os.path.realpath)[absolute](str(root))
+    pruner = Pruner(root, max_depth, exclude, ignore)
+    async for entry, descend in _ascan(root, workers, ordered, pruner, order):
+        if descend:
+            yield (entry.name, entry.path)[absolute]
+
+
+async def asearch(
+    root: str,
+    terms: Iterable[str],
+    exts: str = '',
+    case: bool = False,
+    negative: bool = False,
+    dirs: int = 0,
+    strict: int = 1,
+    regex: bool = False,
+    names: bool = True,
+    workers: int = None,
+    ordered: bool = False,
+    order: str = 'dfs',
+    max_depth: int = None,
+    exclude: str | Iterable[str] = (),
+    ignore: str | Iterable[str] = (),
+) -> AsyncIterator[str]:
+    """
+    Asynchronous version of search, for use with "async for"
+    Takes the same arguments as search, but directories are always read off of the event loop
+
+    example
+        >>> async for path in asearch('~/music', 'alix perez', exts='mp3', workers=4):
+        ...     print(path)
+    """
+    func = {0: afiles, 1: awalk, 2: afolders}[dirs]
+    kwargs = {
+        0: {"exts": exts, "negative": negative, "absolute": True},
+        1: {"dirs": True, "absolute": True},
+        2: {"absolute": True},
+    }[dirs]
+    kwargs.update(
+        workers=workers,
+        ordered=ordered,
+        order=order,
+        max_depth=max_depth,
+        exclude=exclude,
+        ignore=ignore,
+    )
+    scope = (str, lambda x: os.path.split(x)[1])[names]
+    query = compile_query(terms, exts, case, strict, regex)
+    async for i in func(root, **kwargs):
+        if query(scope(i), negative):
+            yield i
+
+
 if __name__ == "__main__":
     folder = r'E:\Projects\Monties\2021\file management'
     folder = 'C:\\Users\\Kenneth\\Downloads\\byextension'
@@ -0,0 +1,296 @@
+"""
+Live change notification for directory trees, built on Linux's inotify through ctypes
+
+A Watcher subscribes to every directory beneath a root and turns the kernel's events into Changes,
+which can be consumed with a plain for loop or an async for loop.
+If a TreeIndex is attached, each change is applied to it as it arrives, so the index never needs a full rescan.
+
+example
+    >>> with Watcher('~/music', index=TreeIndex('~/music').refresh()) as watcher:
+    ...     for change in watcher:
+    ...         print(change.kind, change.path)
+"""
+__all__ = "Change Watcher".split()
+
+from typing import Iterator, NamedTuple, AsyncIterator
+import asyncio, ctypes, ctypes.util, errno, os, select, struct
+
+from . import walking
+from .index import TreeIndex
+
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+
+MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_ONLYDIR
+    | IN_EXCL_UNLINK
+)
+
+EVENT = struct.Struct('iIII')
+
+
+def _libc() -> ctypes.CDLL:
+    """
+    Load the C library and check that it speaks inotify
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError("inotify is only available on Linux")
+    return libc
+
+
+class Change(NamedTuple):
+    """
+    Something that happened to a path under a Watcher's root
+        kind
+            'created', 'deleted', 'modified', 'moved', or 'overflow'
+        path
+            where it happened. For moves this is the destination
+        isdir
+            whether or not the path is a directory
+        source
+            the original path of a move
+    """
+
+    kind: str
+    path: str
+    isdir: bool = False
+    source: str = None
+
+
+class Watcher:
+    """
+    Follow changes to a directory's tree as they happen
+    """
+
+    def __init__(self, root: str = '.', index: TreeIndex | bool = None):
+        """
+        params:
+            root
+                the directory whose tree will be watched
+            index
+                a TreeIndex to keep up to date with every change. It is left open when the Watcher is closed
+                True -> open and refresh root's default TreeIndex, which is closed along with the Watcher
+        """
+        self.root = os.path.realpath(os.path.expanduser(str(root)))
+        self.libc = _libc()
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Could not initialise inotify")
+        self.owned = index is True
+        if self.owned:
+            index = TreeIndex(self.root).refresh()
+        self.index = index if isinstance(index, TreeIndex) else None
+        self.watches = {}
+        self._watch(self.root)
+        self._watch_tree(self.root)
+
+    def __repr__(self):
+        return f"Watcher(root={self.root}, watches={len(self.watches)})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop watching, and close the index if the Watcher opened it
+        """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self.watches.clear()
+            if self.owned:
+                self.index.close()
+
+    def _watch(self, path: str) -> None:
+        """
+        Subscribe to a single directory
+        """
+        wd = self.libc.inotify_add_watch(
+            self.fd, os.fsencode(path), ctypes.c_uint32(MASK)
+        )
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(code, os.strerror(code), path)
+        self.watches[wd] = path
+
+    def _watch_tree(self, path: str) -> None:
+        """
+        Subscribe to every directory beneath a path
+        """
+        try:
+            for folder in walking.folders(path, absolute=True):
+                self._watch(folder)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+    def _unwatch_tree(self, path: str) -> None:
+        """
+        Stop following a path and everything beneath it
+        """
+        prefix = path + os.sep
+        for wd, folder in [*self.watches.items()]:
+            if folder == path or folder.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def _rename_tree(self, source: str, dest: str) -> None:
+        """
+        Keep track of watched directories which have moved within the tree
+        """
+        prefix = source + os.sep
+        for wd, folder in self.watches.items():
+            if folder == source:
+                self.watches[wd] = dest
+            elif folder.startswith(prefix):
+                self.watches[wd] = dest + folder[len(source) :]
+
+    def _events(self) -> Iterator[tuple[int, int, int, str]]:
+        """
+        Drain the inotify descriptor, yielding (wd, mask, cookie, name) for every pending event
+        """
+        while True:
+            try:
+                buffer = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = EVENT.unpack_from(buffer, offset)
+                offset += EVENT.size
+                name = buffer[offset : offset + length].rstrip(b'\0')
+                offset += length
+                yield wd, mask, cookie, os.fsdecode(name)
+
+    def _created(self, path: str, isdir: bool) -> Iterator[Change]:
+        """
+        Changes for a newly created or moved-in path
+        Anything created inside a new directory before its watch was added is reported as well
+        """
+        yield Change('created', path, isdir)
+        if isdir:
+            self._watch(path)
+            self._watch_tree(path)
+            try:
+                for entry, descend in walking._scan(path):
+                    yield Change('created', entry.path, descend)
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+
+    def _apply(self, change: Change) -> None:
+        """
+        Bring the attached index in line with a change
+        """
+        if self.index is None:
+            return
+        if change.kind == 'overflow':
+            self.index.refresh(change.path)
+        elif change.kind == 'deleted':
+            self.index.forget(change.path)
+        elif change.kind == 'moved':
+            self.index.move(change.source, change.path)
+        else:
+            self.index.update(change.path)
+
+    def _changes(self) -> Iterator[Change]:
+        """
+        Translate the pending inotify events into Changes
+        Moves are paired by their cookies. A move whose other half is outside of the tree counts as a creation or deletion
+        """
+        moves = {}
+        for wd, mask, cookie, name in self._events():
+            if mask & IN_Q_OVERFLOW:
+                self._watch_tree(self.root)
+                yield Change('overflow', self.root, True)
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            folder = self.watches.get(wd)
+            if folder is None:
+                continue
+            isdir = bool(mask & IN_ISDIR)
+            path = os.path.join(folder, name) if name else folder
+            if mask & IN_DELETE_SELF:
+                if path == self.root:
+                    yield Change('deleted', path, True)
+            elif mask & IN_MOVED_FROM:
+                moves[cookie] = path, isdir
+            elif mask & IN_MOVED_TO:
+                if cookie in moves:
+                    source, isdir = moves.pop(cookie)
+                    self._rename_tree(source, path)
+                    yield Change('moved', path, isdir, source)
+                else:
+                    yield from self._created(path, isdir)
+            elif mask & IN_CREATE:
+                yield from self._created(path, isdir)
+            elif mask & IN_DELETE:
+                yield Change('deleted', path, isdir)
+            else:
+                yield Change('modified', path, isdir)
+        for source, isdir in moves.values():
+            self._unwatch_tree(source)
+            yield Change('deleted', source, isdir)
+
+    def read(self, timeout: float = None) -> list[Change]:
+        """
+        Wait for changes and return everything that has happened since the last read
+        Params
+            timeout
+                seconds to wait for the first event. None -> wait indefinitely, 0 -> don't wait
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        changes = [*self._changes()]
+        for change in changes:
+            self._apply(change)
+        return changes
+
+    def __iter__(self) -> Iterator[Change]:
+        """
+        Yield changes as they happen, until the Watcher is closed
+        """
+        while self.fd is not None:
+            yield from self.read()
+
+    async def __aiter__(self) -> AsyncIterator[Change]:
+        """
+        Yield changes as they happen, without blocking the event loop
+        """
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        loop.add_reader(self.fd, ready.set)
+        try:
+            while self.fd is not None:
+                await ready.wait()
+                ready.clear()
+                for change in self.read(0):
+                    yield change
+        finally:
+            if self.fd is not None:
+                loop.remove_reader(self.fd)
@@ -0,0 +1,205 @@
+"""
+Tests for the handles: Things, Places, Libraries and Scanners
+"""
+
+from typing import Iterator
+import io, os, pickle, random, sqlite3
+
+import pytest
+
+from filey import handles, index, walking
+from filey.handles import File, Library, Place, Scanner, Thing
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(index, 'CACHE', str(tmp_path / 'cache'))
+    root = tmp_path / 'tree'
+    os.makedirs(root / 'inner' / 'deeper')
+    for path in ('song.mp3', 'inner/song two.flac', 'inner/deeper/notes.txt'):
+        (root / path).write_text(path)
+    return str(root)
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """
+    Every TreeIndex opened by the handles
+    """
+    indexes = []
+
+    class Recorder(handles.TreeIndex):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            indexes.append(self)
+
+    monkeypatch.setattr(handles, 'TreeIndex', Recorder)
+    return indexes
+
+
+def closed(tree: index.TreeIndex) -> bool:
+    try:
+        tree.connection.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+@pytest.mark.parametrize('handle', [Place, Library])
+def test_index_searches_close_their_index(tree, opened, handle):
+    found = sorted(handle(tree)('song', index=True))
+    assert found == sorted(handle(tree)('song'))
+    assert opened and all(map(closed, opened))
+
+
+def test_given_indexes_are_left_open(tree):
+    with index.TreeIndex(tree).refresh() as given:
+        assert [*Place(tree)('notes', index=given)]
+        assert not closed(given)
+
+
+@pytest.mark.parametrize('handle', [Place, Library])
+@pytest.mark.parametrize(
+    'option', [{'workers': 2}, {'order': 'bfs'}, {'max_depth': 1}, {'exclude': 'inner'}]
+)
+def test_index_searches_reject_walk_options(tree, opened, handle, option):
+    with pytest.raises(TypeError, match=[*option][0]):
+        [*handle(tree)('song', index=True, **option)]
+    assert all(map(closed, opened))
+    assert [*handle(tree)('song', **option)]
+
+
+@pytest.mark.parametrize('handle', [Thing, File, Place])
+def test_relative_paths_resolve_against_the_cwd_at_construction(
+    tree, monkeypatch, handle
+):
+    monkeypatch.chdir(os.path.join(tree, 'inner'))
+    name = ('song two.flac', 'deeper')[handle is Place]
+    thing = handle(name)
+    monkeypatch.chdir(os.sep)
+    assert thing.path == os.path.join(os.path.realpath(tree), 'inner', name)
+    assert thing.exists
+
+
+HEADERS = {
+    'png': b'\x89PNG\r\n\x1a\n' + bytes(24),
+    'gif': b'GIF89a' + bytes(24),
+    'pdf': b'%PDF-1.4' + bytes(24),
+    'zip': b'PK\x03\x04' + bytes(24),
+}
+
+
+def test_profile_views_match_the_old_properties(tmp_path):
+    """
+    mimes, kinds and exts should give what the old properties did, in walk order, even when headers are read on a pool
+    Files with unknown extensions have to be sniffed, so they are interleaved with ones classified by extension
+    """
+    rng = random.Random(21)
+    for i in range(60):
+        kind = rng.choice([*HEADERS])
+        ext = rng.choice([kind, 'bin', 'dat', ''])
+        (tmp_path / f"{i:02}.{ext}".rstrip('.')).write_bytes(HEADERS[kind])
+    (tmp_path / 'notes.txt').write_text('plain')
+    paths = [*walking.files(str(tmp_path))]
+    mimes = [*dict.fromkeys(filter(None, (File(path).mime for path in paths)))]
+    exts = [*dict.fromkeys(filter(None, (File(path).ext for path in paths)))]
+    place = Place(str(tmp_path))
+    assert place.mimes == tuple(mimes)
+    assert place.kinds == tuple(mime.split('/')[1] for mime in mimes)
+    assert place.exts == tuple(exts)
+    assert place.profile(workers=1) == place.profile(workers=4)
+
+
+def test_usage_sees_changes_made_since_the_last_du(tmp_path):
+    (tmp_path / 'inner').mkdir()
+    (tmp_path / 'five').write_bytes(bytes(5))
+    place = Place(str(tmp_path))
+    assert place.usage.size == 5
+    (tmp_path / 'ten').write_bytes(bytes(10))
+    assert place.usage.size == place.size == 15
+    (tmp_path / 'inner' / 'twenty').write_bytes(bytes(20))
+    assert place.usage.size == place.size == 35
+    assert place.usage.files == 3
+
+
+def test_size_walks_the_tree_once_per_miss(tmp_path, monkeypatch):
+    (tmp_path / 'inner').mkdir()
+    (tmp_path / 'inner' / 'five').write_bytes(bytes(5))
+    passes, tallies = [], handles.SIZES._tallies
+
+    def counted(*args, **kwargs):
+        passes.append(args)
+        return tallies(*args, **kwargs)
+
+    monkeypatch.setattr(handles.SIZES, '_tallies', counted)
+    place = Place(str(tmp_path))
+    assert place.size == 5 and len(passes) == 1
+    (tmp_path / 'inner' / 'ten').write_bytes(bytes(10))
+    assert place.size == 15 and len(passes) == 2
+    assert place.size == 15 and len(passes) == 3
+
+
+def test_handles_pickle_after_caching_properties(tree):
+    song, place = File(os.path.join(tree, 'song.mp3')), Place(tree)
+    song.mime, song.kind, place.size, place.exts
+    for handle in (song, place):
+        copy = pickle.loads(pickle.dumps(handle))
+        assert type(copy) is type(handle) and copy.path == handle.path
+        assert not copy._fresh
+    assert copy.size == place.size
+
+
+def spans(scanner: Scanner, texts: list[str], folder) -> Iterator[tuple]:
+    """
+    Compare the offsets a scanner finds chunk by chunk with those finditer finds in the whole of each text
+    """
+    path = str(folder / 'text.txt')
+    for text in texts:
+        with open(path, 'w', encoding='utf-8', newline='') as fob:
+            fob.write(text)
+        content = text.encode('utf-8') if 'b' in scanner.mode else text
+        whole = [match.span() for match in scanner.content.finditer(content)]
+        yield text, scanner.offsets(path), whole
+
+
+def random_texts(alphabet: str, count: int = 3000) -> list[str]:
+    rng = random.Random(14)
+    return [''.join(rng.choices(alphabet, k=rng.randint(0, 40))) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    'keywords, strict, alphabet, mode',
+    [
+        ('aa a', False, 'ab \n', 'r'),
+        ('ab ba b aab', False, 'ab \n', 'r'),
+        ('a b', True, 'ab \n', 'r'),
+        ('ééé é', False, 'éa \n', 'r'),
+        ('ééé é', False, 'éa \n', 'rb'),
+        ('éé', True, 'éa \n', 'rb'),
+    ],
+)
+def test_offsets_across_chunk_boundaries(
+    tmp_path, monkeypatch, keywords, strict, alphabet, mode
+):
+    """
+    Read as bytes, non-ASCII keywords are longer than they have characters, and the overlap must cover that
+    FileIO stands in for open so that binary files are read in chunks rather than memory-mapped
+    """
+    monkeypatch.setattr(handles, 'CHUNK', 7)
+    opener = (open, io.FileIO)['b' in mode]
+    scanner = Scanner(keywords, mode=mode, strict=strict, opener=opener)
+    for text, chunked, whole in spans(scanner, random_texts(alphabet), tmp_path):
+        assert chunked == whole, text
+
+
+@pytest.mark.parametrize('keywords', ['aa a', 'ab ba b aab abab', 'b bb bbb'])
+def test_automaton_offsets_across_chunk_boundaries(tmp_path, monkeypatch, keywords):
+    """
+    The automaton's leftmost-longest matches must come out the same chunk by chunk as they do whole
+    """
+    monkeypatch.setattr(handles, 'CHUNK', 7)
+    monkeypatch.setattr(handles, 'AUTOMATON', 2)
+    scanner = Scanner(keywords, strict=False)
+    assert scanner.automatic
+    for text, chunked, whole in spans(scanner, random_texts('ab \n'), tmp_path):
+        assert chunked == whole, text
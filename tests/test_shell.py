@@ -0,0 +1,187 @@
+"""
+Tests for the copy engine behind copy_file, copy_tree, move and move_file
+"""
+
+import errno, filecmp, os, random, shutil
+
+import pytest
+
+from filey import shell
+
+
+@pytest.fixture
+def data(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(random.Random(25).randbytes(3 * shell.BUFFER + 12345))
+    os.utime(path, ns=(1_000_000_000, 2_000_000_000))
+    return str(path)
+
+
+def same(source: str, copy: str) -> bool:
+    original, duplicate = os.stat(source), os.stat(copy)
+    return (
+        (os.path.isdir(source) or filecmp.cmp(source, copy, shallow=False))
+        and original.st_mode == duplicate.st_mode
+        and original.st_mtime_ns == duplicate.st_mtime_ns
+    )
+
+
+def refuse(code: int):
+    def method(*args):
+        raise OSError(code, os.strerror(code))
+
+    return method
+
+
+@pytest.mark.parametrize(
+    'copy_file_range, sendfile',
+    [
+        (None, None),
+        (refuse(errno.EXDEV), None),
+        (refuse(errno.ENOSYS), refuse(errno.EINVAL)),
+        (lambda *args: 0, None),
+        (lambda *args: 0, lambda *args: 0),
+    ],
+    ids=['kernel', 'sendfile', 'buffer', 'empty-sendfile', 'empty-buffer'],
+)
+def test_copy_file_falls_back(data, tmp_path, monkeypatch, copy_file_range, sendfile):
+    """
+    Methods which refuse a pair of files, or copy nothing from a file which isn't empty, must give way to the next
+    """
+    for name, method in (('copy_file_range', copy_file_range), ('sendfile', sendfile)):
+        if method and hasattr(os, name):
+            monkeypatch.setattr(os, name, method)
+    copy = shell.copy_file(data, str(tmp_path / 'copy.bin'))
+    assert same(data, copy)
+
+
+def test_copy_file_raises_real_errors(data, tmp_path, monkeypatch):
+    monkeypatch.setattr(os, 'copy_file_range', refuse(errno.EIO))
+    with pytest.raises(OSError) as error:
+        shell.copy_file(data, str(tmp_path / 'copy.bin'))
+    assert error.value.errno == errno.EIO
+
+
+def test_copy_file_into_a_directory(data, tmp_path):
+    (tmp_path / 'folder').mkdir()
+    copy = shell.copy_file(data, str(tmp_path / 'folder'))
+    assert copy == str(tmp_path / 'folder' / 'data.bin') and same(data, copy)
+
+
+def test_copy_file_refuses_to_copy_a_file_onto_itself(data):
+    expected = open(data, 'rb').read()
+    with pytest.raises(shutil.SameFileError):
+        shell.copy_file(data, os.path.dirname(data))
+    assert open(data, 'rb').read() == expected
+
+
+@pytest.mark.parametrize('workers', [1, 3, None])
+def test_copy_tree(data, tmp_path, workers):
+    source = tmp_path / 'source'
+    for folder in ('a', 'a/b', 'a/b/c', 'empty'):
+        (source / folder).mkdir(parents=True)
+        for i in range(5):
+            (source / folder / f"{i}.txt").write_text(folder * i)
+    os.symlink(data, source / 'a' / 'link')
+    dest = shell.copy_tree(str(source), str(tmp_path / 'dest'), workers=workers)
+    for root, folders, files in os.walk(source):
+        for name in folders + files:
+            path = os.path.join(root, name)
+            assert same(path, os.path.join(dest, os.path.relpath(path, source)))
+
+
+def links(folder) -> dict[str, str]:
+    """
+    Give a directory a symlink to a file, one to a directory, and a broken one, returning where each points
+    """
+    (folder / 'target').mkdir()
+    (folder / 'target' / 'file.txt').write_text('target')
+    targets = {
+        'file-link': str(folder / 'target' / 'file.txt'),
+        'folder-link': str(folder / 'target'),
+        'broken-link': str(folder / 'nowhere'),
+    }
+    for name, target in targets.items():
+        os.symlink(target, folder / name)
+    return targets
+
+
+def test_copy_tree_recreates_links(tmp_path):
+    source = tmp_path / 'source'
+    source.mkdir()
+    targets = links(source)
+    dest = shell.copy_tree(str(source), str(tmp_path / 'dest'))
+    for name, target in targets.items():
+        assert os.path.islink(os.path.join(dest, name))
+        assert os.readlink(os.path.join(dest, name)) == target
+
+
+def test_copy_tree_copies_locked_out_directories_without_metadata(data, tmp_path):
+    locked = tmp_path / 'source' / 'Config.Msi'
+    locked.mkdir(parents=True)
+    shell.copy_file(data, str(locked))
+    dest = shell.copy_tree(str(tmp_path / 'source'), str(tmp_path / 'dest'), False)
+    copy = os.path.join(dest, 'Config.Msi', 'data.bin')
+    assert filecmp.cmp(data, copy, shallow=False)
+    assert os.stat(copy).st_mtime_ns != os.stat(data).st_mtime_ns
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_copy_tree_removes_a_partial_copy(data, tmp_path, monkeypatch, workers):
+    source = tmp_path / 'source'
+    (source / 'inner').mkdir(parents=True)
+    for i in range(10):
+        shell.copy_file(data, str(source / 'inner' / f"{i}.bin"))
+    copy_file = shell.copy_file
+
+    def failing(source, dest, metadata=True):
+        if dest.endswith('5.bin'):
+            raise OSError(errno.EIO, os.strerror(errno.EIO))
+        return copy_file(source, dest, metadata)
+
+    monkeypatch.setattr(shell, 'copy_file', failing)
+    with pytest.raises(OSError):
+        shell.copy_tree(str(source), str(tmp_path / 'dest'), workers=workers)
+    assert not os.path.lexists(tmp_path / 'dest')
+
+
+@pytest.fixture
+def across_devices(monkeypatch):
+    def rename(source, dest):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    monkeypatch.setattr(os, 'rename', rename)
+
+
+def test_move_copies_across_devices(data, tmp_path, across_devices):
+    (tmp_path / 'dest').mkdir()
+    expected = open(data, 'rb').read()
+    moved = shell.move(data, str(tmp_path / 'dest'))
+    assert not os.path.exists(data) and open(moved, 'rb').read() == expected
+
+
+def test_move_recreates_links_across_devices(tmp_path, across_devices):
+    (tmp_path / 'source').mkdir()
+    (tmp_path / 'dest').mkdir()
+    targets = links(tmp_path / 'source')
+    for name, target in targets.items():
+        moved = shell.move(str(tmp_path / 'source' / name), str(tmp_path / 'dest'))
+        assert os.path.islink(moved) and os.readlink(moved) == target
+        assert not os.path.lexists(tmp_path / 'source' / name)
+    moved = shell.move(str(tmp_path / 'source'), str(tmp_path / 'dest'))
+    assert not os.path.exists(tmp_path / 'source')
+    assert open(os.path.join(moved, 'target', 'file.txt')).read() == 'target'
+
+
+def test_move_leaves_the_source_when_copying_fails(
+    data, tmp_path, monkeypatch, across_devices
+):
+    def failing(source, dest, metadata=True):
+        open(dest, 'wb').close()
+        raise OSError(errno.EIO, os.strerror(errno.EIO))
+
+    (tmp_path / 'dest').mkdir()
+    monkeypatch.setattr(shell, 'copy_file', failing)
+    with pytest.raises(OSError):
+        shell.move(data, str(tmp_path / 'dest'))
+    assert os.path.exists(data) and not os.listdir(tmp_path / 'dest')
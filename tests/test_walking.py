@@ -0,0 +1,327 @@
+"""
+Tests for the traversal engine shared by walk, files and folders
+The old recursive walkers are kept here as references, so the new ones can be checked against them
+"""
+
+import os, random, re, sys, time, traceback
+
+import pytest
+
+from filey import walking
+
+LOCKOUTS = walking.LOCKOUTS
+
+benchmark = pytest.mark.skipif(
+    not os.environ.get('FILEY_BENCHMARKS'),
+    reason="timing benchmarks only run when FILEY_BENCHMARKS is set",
+)
+
+
+def old_walk(root='.', dirs=False, absolute=True):
+    root = (str, os.path.realpath)[absolute](str(root))
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and not name.lower() in LOCKOUTS:
+            if dirs:
+                yield (name, path)[absolute]
+            yield from old_walk(path, dirs=dirs, absolute=absolute)
+        else:
+            yield (name, path)[absolute]
+
+
+def old_parse_extensions(extensions):
+    sep = [i for i in ',`* ' if i in extensions]
+    pattern = '|'.join(f'\\.{i}$' for i in extensions.split(sep[0] if sep else None))
+    return re.compile(pattern, re.I)
+
+
+def old_files(root='.', exts='', negative=False, absolute=True):
+    root = (str, os.path.realpath)[absolute](str(root))
+    pat = old_parse_extensions(exts)
+    predicate = lambda x: not bool(pat.search(x)) if negative else bool(pat.search(x))
+    name = os.path.split(root)[1]
+    if not (name.lower() in LOCKOUTS or root.lower() in LOCKOUTS):
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if os.path.isdir(path) and not name.lower() in LOCKOUTS:
+                yield from old_files(
+                    path, exts=exts, negative=negative, absolute=absolute
+                )
+            elif predicate(path):
+                yield (name, path)[absolute]
+
+
+def old_folders(root='.', absolute=True):
+    root = (str, os.path.realpath)[absolute](str(root))
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and not name.lower() in LOCKOUTS:
+            yield (name, path)[absolute]
+            yield from old_folders(path, absolute=absolute)
+
+
+def build(root, depth=3, width=3, files=('a.txt', 'b.PY', 'c.tar.gz', 'd')):
+    """
+    Make a small tree with a few files in every directory, and a locked out directory at the top
+    """
+    for name in files:
+        open(os.path.join(root, name), 'w').close()
+    if depth:
+        for i in range(width):
+            folder = os.path.join(root, f"dir {i}")
+            os.mkdir(folder)
+            build(folder, depth - 1, width, files)
+    return root
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = build(str(tmp_path))
+    os.mkdir(os.path.join(root, 'Config.Msi'))
+    open(os.path.join(root, 'Config.Msi', 'hidden.txt'), 'w').close()
+    return root
+
+
+@pytest.mark.parametrize('absolute', [True, False])
+@pytest.mark.parametrize('dirs', [True, False])
+def test_walk_matches_old_walk(tree, dirs, absolute):
+    assert [*walking.walk(tree, dirs, absolute)] == [*old_walk(tree, dirs, absolute)]
+
+
+@pytest.mark.parametrize('absolute', [True, False])
+@pytest.mark.parametrize('negative', [True, False])
+@pytest.mark.parametrize('exts', ['', 'txt', 'py', 'txt py', 'tar.gz', 'g?z'])
+def test_files_matches_old_files(tree, exts, negative, absolute):
+    new = [*walking.files(tree, exts, negative, absolute)]
+    assert new == [*old_files(tree, exts, negative, absolute)]
+
+
+@pytest.mark.parametrize('absolute', [True, False])
+def test_folders_matches_old_folders(tree, absolute):
+    assert [*walking.folders(tree, absolute)] == [*old_folders(tree, absolute)]
+
+
+@pytest.mark.parametrize('order', walking.ORDERS)
+def test_orders_and_workers_find_the_same_paths(tree, order):
+    serial = sorted(walking.walk(tree, dirs=True))
+    assert sorted(walking.walk(tree, dirs=True, order=order)) == serial
+    assert sorted(walking.walk(tree, dirs=True, order=order, workers=3)) == serial
+    ordered = [*walking.walk(tree, dirs=True, order=order, workers=3, ordered=True)]
+    assert ordered == [*walking.walk(tree, dirs=True, order=order)]
+
+
+def test_symlinked_content_keeps_the_link_path(tmp_path):
+    root, target = str(tmp_path / 'root'), str(tmp_path / 'target')
+    for folder in (root, target):
+        os.mkdir(folder)
+        build(folder, depth=0)
+    os.symlink(target, os.path.join(root, 'link'))
+    found = [*walking.files(root)]
+    assert os.path.join(root, 'link', 'a.txt') in found
+    assert not any(path.startswith(target) for path in found)
+
+
+def test_symlinks_to_locked_out_directories_are_not_entered(tmp_path):
+    locked = tmp_path / 'config.msi'
+    os.mkdir(locked)
+    open(locked / 'hidden.txt', 'w').close()
+    os.mkdir(tmp_path / 'root')
+    os.symlink(locked, tmp_path / 'root' / 'innocent')
+    root = str(tmp_path / 'root')
+    assert [*walking.files(root, absolute=False)] == ['innocent']
+    assert [*walking.folders(root)] == []
+    assert [*walking.walk(root, dirs=True, absolute=False)] == ['innocent']
+
+
+class Syscalls:
+    """
+    Count the calls made to a few os functions, which each cost a syscall
+    """
+
+    names = 'stat', 'lstat', 'listdir', 'scandir'
+
+    def __init__(self, monkeypatch):
+        self.counts = dict.fromkeys(self.names, 0)
+        for name in self.names:
+            monkeypatch.setattr(os, name, self.wrap(name, getattr(os, name)))
+
+    def wrap(self, name, function):
+        def wrapper(*args, **kwargs):
+            self.counts[name] += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+
+@pytest.mark.parametrize('walker', ['walk', 'files', 'folders'])
+def test_syscall_counts(tree, monkeypatch, walker):
+    """
+    The old walkers stat every entry on top of listing each directory
+    The new ones only list each directory, and DirEntry's type cache answers is_dir for free
+    """
+    real = os.path.realpath(tree)
+    entries = len([*old_walk(real, dirs=True)])
+    listed = 1 + len([*old_folders(real)])
+    old = Syscalls(monkeypatch)
+    [*globals()['old_' + walker](real)]
+    new = Syscalls(monkeypatch)
+    [*getattr(walking, walker)(real)]
+    assert old.counts['stat'] >= entries
+    assert old.counts['listdir'] == listed
+    assert new.counts['stat'] == 0
+    assert new.counts['listdir'] == 0
+    assert new.counts['scandir'] == listed
+    assert sum(new.counts.values()) < sum(old.counts.values()) / 2
+
+
+def chain(root, depth, files):
+    """
+    Make a tree of single directories nested depth levels deep, with the given number of files in each
+    """
+    folder = root
+    for level in range(depth + 1):
+        for i in range(files):
+            open(os.path.join(folder, f"{i}.txt"), 'w').close()
+        if level < depth:
+            folder = os.path.join(folder, 'd')
+            os.mkdir(folder)
+    return root
+
+
+@pytest.mark.parametrize('order', walking.ORDERS)
+def test_depth_is_not_limited_by_recursion(tmp_path, order):
+    root = chain(str(tmp_path), 200, 1)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(traceback.extract_stack()) + 50)
+    try:
+        with pytest.raises(RecursionError):
+            [*old_walk(root)]
+        paths = [*walking.walk(root, dirs=True, order=order)]
+        folders = [*walking.folders(root, order=order)]
+    finally:
+        sys.setrecursionlimit(limit)
+    assert len(paths) == 401
+    assert len(folders) == 200 and folders[-1].count(os.sep + 'd') == 200
+
+
+def deepest(paths):
+    """
+    Exhaust an iterator, returning the most frames ever on the stack while doing so
+    """
+    most = 0
+
+    def profile(frame, event, arg):
+        nonlocal most
+        if event != 'call':
+            return
+        depth = 0
+        while frame:
+            depth, frame = depth + 1, frame.f_back
+        most = max(most, depth)
+
+    sys.setprofile(profile)
+    try:
+        for path in paths:
+            pass
+    finally:
+        sys.setprofile(None)
+    return most
+
+
+@pytest.mark.parametrize('order', walking.ORDERS)
+def test_stack_depth_does_not_grow_with_the_tree(tmp_path, order):
+    """
+    Every path should reach the caller through the same number of frames, however deep it is,
+    where the recursive walkers passed it up through one generator per level
+    """
+    os.mkdir(tmp_path / 'shallow')
+    os.mkdir(tmp_path / 'deep')
+    shallow = chain(str(tmp_path / 'shallow'), 5, 1)
+    deep = chain(str(tmp_path / 'deep'), 200, 1)
+    for walker in (walking.walk, walking.files, walking.folders):
+        assert deepest(walker(deep, order=order)) == deepest(
+            walker(shallow, order=order)
+        )
+    assert deepest(old_walk(deep)) > deepest(old_walk(shallow)) + 150
+
+
+@benchmark
+def test_depth_benchmark(tmp_path):
+    """
+    The cost of each path shouldn't depend on how deep it is
+    A 200-level tree should walk about as fast as a flat tree with the same content.
+    Wall-clock ratios are at the mercy of the machine's load, so this only runs on request
+    """
+    os.mkdir(tmp_path / 'deep')
+    os.mkdir(tmp_path / 'flat')
+    deep = chain(str(tmp_path / 'deep'), 200, 25)
+    flat = str(tmp_path / 'flat')
+    for level in range(201):
+        for i in range(25):
+            open(os.path.join(flat, f"{level}-{i}.txt"), 'w').close()
+        if level < 200:
+            os.mkdir(os.path.join(flat, f"d{level}"))
+
+    def cost(root):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            count = sum(1 for _ in walking.walk(root, dirs=True))
+            best = min(best, time.perf_counter() - start)
+        assert count == 201 * 26 - 1
+        return best
+
+    assert cost(deep) < 3 * cost(flat)
+
+
+@pytest.mark.parametrize('tight', [False, True])
+@pytest.mark.parametrize('case', [0, re.I])
+def test_term_matcher_agrees_with_permutations(tight, case):
+    """
+    Strict modes 1 and 2 must give the same answers as the permutation regexes they replaced
+    """
+    rng = random.Random(5)
+    for _ in range(1000):
+        terms = [
+            ''.join(rng.choices('abA', k=rng.randint(1, 3)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        name = ''.join(rng.choices('abA _-\n', k=rng.randint(0, 12)))
+        expected = bool(walking._term_perms(terms, case, tight).search(name))
+        assert walking.TermMatcher(terms, case, tight).search(name) == expected, (
+            terms,
+            name,
+        )
+
+
+@pytest.mark.parametrize('strict', [1, 2])
+@pytest.mark.parametrize('terms', ['', '   '])
+def test_empty_terms_walk_everything(tree, strict, terms):
+    everything = sorted(walking.walk(tree))
+    assert sorted(walking.search(tree, terms, strict=strict)) == everything
+    assert [*walking.search(tree, terms, strict=strict, negative=True)] == []
+
+
+@benchmark
+def test_term_count_benchmark():
+    """
+    The cost of compiling and matching n terms should grow with n, not with n! as the permutation regexes did
+    Going from 2 to 8 terms multiplies the number of permutations by 20160, so a bound of 32 leaves plenty of room.
+    Wall-clock ratios are at the mercy of the machine's load, so this only runs on request
+    """
+    name = "the quick brown fox jumps over the lazy dog " * 4
+    words = "lazy dog over the quick fox brown jumps".split()
+
+    def cost(make, n):
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            for tight in (False, True):
+                matcher = make(words[:n], re.I, tight)
+                for _ in range(20):
+                    matcher.search(name)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    costs = {n: cost(walking.TermMatcher, n) for n in (2, 4, 6, 8)}
+    assert costs[8] < 32 * costs[2]
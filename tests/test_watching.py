@@ -0,0 +1,48 @@
+"""
+Tests for the inotify Watcher
+"""
+
+import os, sqlite3
+
+import pytest
+
+from filey import index
+from filey.handles import Place
+from filey.watching import Watcher
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists('/proc/sys/fs/inotify'),
+    reason="inotify is only available on Linux",
+)
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(index, 'CACHE', str(tmp_path / 'cache'))
+    os.mkdir(tmp_path / 'tree')
+    return str(tmp_path / 'tree')
+
+
+def closed(tree: index.TreeIndex) -> bool:
+    try:
+        tree.connection.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_watch_closes_the_index_it_opened(tree):
+    with Place(tree).watch(index=True) as watcher:
+        open(os.path.join(tree, 'new.txt'), 'w').close()
+        assert 'created' in [change.kind for change in watcher.read(1)]
+        assert [*watcher.index.paths()] == [os.path.join(tree, 'new.txt')]
+    assert closed(watcher.index)
+
+
+def test_watch_leaves_given_indexes_open(tree):
+    with index.TreeIndex(tree).refresh() as given:
+        with Place(tree).watch(index=given) as watcher:
+            assert watcher.index is given
+        assert not closed(given)
+    with Watcher(tree) as watcher:
+        assert watcher.index is None